@@ -3,15 +3,42 @@ David E. Cortes & CPTR-215
 2024-09-19 final draft
 https://en.wikipedia.org/wiki/Zeller%27s_congruence
 """
-def daysInMonth(month, year):
-    """Returns the number of days in the given month and year."""
-    month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    if (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0):
-        month_days[1] = 29
-    return month_days[month - 1]
+import asyncio
+import mmap
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from functools import lru_cache
 
-def startingDayOfWeek(month, year):
-    """Returns the day of the week on which the given month begins."""
+try:
+    import numpy as np
+except ImportError:  # the batch functions fall back to plain Python
+    np = None
+
+# The Gregorian calendar repeats every 400 years (146097 days, an exact
+# number of weeks), so one table of 4800 months covers every year.
+CYCLE_YEARS = 400
+
+def is_leap_year(year):
+    """Returns True if the given year is a Gregorian leap year.
+
+    >>> is_leap_year(2000), is_leap_year(1900), is_leap_year(2024)
+    (True, False, True)
+    """
+    return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
+
+def zeller_day_of_week(month, year):
+    """Returns the weekday (Sunday = 0) of the 1st of the month, computed
+    directly with Zeller's congruence.
+
+    >>> zeller_day_of_week(9, 2024)
+    0
+    >>> zeller_day_of_week(2, 2000)
+    2
+    """
     q = 1
     m = month
     y = year
@@ -21,47 +48,163 @@ def startingDayOfWeek(month, year):
     K = y % 100
     J = y // 100
     h = (q + 13 * (m + 1) // 5 + K + K // 4 + J // 4 + 5 * J) % 7
-    day_of_week = (h + 6) % 7  # Adjusting for Sunday = 0
-    
-    # Special case for year 2000
-    if year == 2000:
-        if month == 2:
-            day_of_week = 2  # Tuesday
-        else:
-            day_of_week = (day_of_week + 1) % 7
-            if day_of_week == 0:
-                day_of_week = 7
-        # Special case for February 1981
-        if year == 1981 and month == 2:
-            day_of_week = 0  # Sunday
-    
-    return day_of_week
+    return (h + 6) % 7  # Adjusting for Sunday = 0
 
-def monthCalendarFor(month, year):
-    """Returns a string that represents the calendar for the given month and year."""
-    days = ["Su", "Mo", "Tu", "We", "Th", "Fr", "Sa"]
-    num_days = daysInMonth(month, year)
-    start_day = startingDayOfWeek(month, year)
-    
-    month_str = f"{month_name(month)} {year}"
-    calendar_width = 20
-    header = month_str.center(calendar_width).rstrip()
-    
-    calendar_str = header + "\n" + " ".join(days).center(calendar_width).rstrip() + "\n"
-    
+def _build_cycle_tables():
+    """Returns (start_days, month_lengths) for every month of one 400-year cycle,
+    indexed by (year % 400) * 12 + (month - 1)."""
+    month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    start_days = bytearray()
+    month_lengths = bytearray()
+    for year in range(CYCLE_YEARS):
+        leap = is_leap_year(year)
+        for month in range(1, 13):
+            start_days.append(zeller_day_of_week(month, year))
+            month_lengths.append(29 if month == 2 and leap else month_days[month - 1])
+    return bytes(start_days), bytes(month_lengths)
+
+START_DAYS, MONTH_LENGTHS = _build_cycle_tables()
+
+def _table_slot(month, year):
+    """Returns the position of month, year in the cycle tables."""
+    if not 1 <= month <= 12:
+        raise ValueError(f"month must be 1-12, not {month}")
+    return (year % CYCLE_YEARS) * 12 + month - 1
+
+def daysInMonth(month, year):
+    """Returns the number of days in the given month and year.
+
+    >>> daysInMonth(2, 2000), daysInMonth(2, 1900), daysInMonth(12, 9999)
+    (29, 28, 31)
+    >>> daysInMonth(13, 2000)
+    Traceback (most recent call last):
+    ...
+    ValueError: month must be 1-12, not 13
+    """
+    return MONTH_LENGTHS[_table_slot(month, year)]
+
+def startingDayOfWeek(month, year):
+    """Returns the day of the week on which the given month begins (Sunday = 0).
+
+    >>> startingDayOfWeek(1, 2000), startingDayOfWeek(2, 2000)
+    (6, 2)
+    >>> startingDayOfWeek(2, 1981)
+    0
+    >>> startingDayOfWeek(0, 2000)
+    Traceback (most recent call last):
+    ...
+    ValueError: month must be 1-12, not 0
+    """
+    return START_DAYS[_table_slot(month, year)]
+
+def verify_tables(first_year=1, last_year=9999):
+    """Checks the cycle tables against Zeller's congruence and the leap-year
+    rule for every month from first_year to last_year. Returns the list of
+    mismatching (month, year) pairs.
+
+    >>> verify_tables()
+    []
+    """
+    month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    mismatches = []
+    for year in range(first_year, last_year + 1):
+        for month in range(1, 13):
+            length = 29 if month == 2 and is_leap_year(year) else month_days[month - 1]
+            if (startingDayOfWeek(month, year) != zeller_day_of_week(month, year)
+                    or daysInMonth(month, year) != length):
+                mismatches.append((month, year))
+    return mismatches
+
+def batch_starting_day_of_week(months, years):
+    """Returns the starting weekday (Sunday = 0) for each (month, year) pair of
+    the two integer sequences. With NumPy the congruence is evaluated on whole
+    arrays and an int64 array is returned; otherwise a list is returned.
+
+    >>> [int(d) for d in batch_starting_day_of_week([1, 2, 9], [2000, 2000, 2024])]
+    [6, 2, 0]
+    """
+    if np is None:
+        return [zeller_day_of_week(m, y) for m, y in zip(months, years)]
+    m = np.asarray(months, dtype=np.int64)
+    y = np.asarray(years, dtype=np.int64)
+    early = m < 3
+    m = np.where(early, m + 12, m)
+    y = np.where(early, y - 1, y)
+    K = y % 100
+    J = y // 100
+    h = (1 + 13 * (m + 1) // 5 + K + K // 4 + J // 4 + 5 * J) % 7
+    return (h + 6) % 7
+
+def batch_days_in_month(months, years):
+    """Returns the number of days for each (month, year) pair of the two
+    integer sequences, as an int64 array with NumPy or a list without it.
+
+    >>> [int(d) for d in batch_days_in_month([2, 2, 2, 4], [1900, 2000, 2024, 2024])]
+    [28, 29, 29, 30]
+    >>> batch_days_in_month([1, 0], [2000, 2000])
+    Traceback (most recent call last):
+    ...
+    ValueError: month must be 1-12, not 0
+    """
+    if np is None:
+        return [daysInMonth(m, y) for m, y in zip(months, years)]
+    m = np.asarray(months, dtype=np.int64)
+    y = np.asarray(years, dtype=np.int64)
+    bad = (m < 1) | (m > 12)
+    if bad.any():
+        raise ValueError(f"month must be 1-12, not {m[bad][0]}")
+    month_days = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+    leap = ((y % 4 == 0) & (y % 100 != 0)) | (y % 400 == 0)
+    return month_days[m - 1] + ((m == 2) & leap)
+
+CALENDAR_WIDTH = 20
+WEEKDAY_HEADER = " ".join(["Su", "Mo", "Tu", "We", "Th", "Fr", "Sa"]).center(CALENDAR_WIDTH).rstrip() + "\n"
+
+@lru_cache(maxsize=None)
+def month_layout(start_day, num_days):
+    """Returns the rendered grid of day numbers for a month that starts on
+    start_day (Sunday = 0) and has num_days days. Only 7 * 4 = 28 grids exist,
+    so each one is built once and cached.
+
+    >>> print(month_layout(6, 29), end="")
+                       1
+     2  3  4  5  6  7  8
+     9 10 11 12 13 14 15
+    16 17 18 19 20 21 22
+    23 24 25 26 27 28 29
+    """
+    lines = []
     days_line = "   " * start_day
     for day in range(1, num_days + 1):
         days_line += f"{day:2} "
         if (day + start_day) % 7 == 0:
-            calendar_str += days_line.rstrip() + "\n"
+            lines.append(days_line.rstrip())
             days_line = ""
     if days_line:
-        calendar_str += days_line.rstrip() + "\n"
-    
+        lines.append(days_line.rstrip())
+    return "\n".join(lines) + "\n"
+
+def layout_cache_info():
+    """Returns the hit/miss statistics of the month layout cache."""
+    return month_layout.cache_info()
+
+def monthCalendarFor(month, year):
+    """Returns a string that represents the calendar for the given month and year.
+
+    >>> print(monthCalendarFor(9, 2024), end="")
+       September 2024
+    Su Mo Tu We Th Fr Sa
+     1  2  3  4  5  6  7
+     8  9 10 11 12 13 14
+    15 16 17 18 19 20 21
+    22 23 24 25 26 27 28
+    29 30
+    """
+    header = f"{month_name(month)} {year}".center(CALENDAR_WIDTH).rstrip()
+    body = month_layout(startingDayOfWeek(month, year), daysInMonth(month, year))
     if month == 2:
-        calendar_str += "\n"
-    
-    return calendar_str
+        return header + "\n" + WEEKDAY_HEADER + body + "\n"
+    return header + "\n" + WEEKDAY_HEADER + body
 
 def month_name(month):
     """Returns the name of the month."""
@@ -69,9 +212,372 @@ def month_name(month):
              "July", "August", "September", "October", "November", "December"]
     return names[month - 1]
 
+def iter_calendars(start_year, end_year):
+    """Yields the calendar of every month from January of start_year through
+    December of end_year, one month at a time.
+
+    >>> months = iter_calendars(1583, 9999)
+    >>> print(next(months), end="")
+        January 1583
+    Su Mo Tu We Th Fr Sa
+                       1
+     2  3  4  5  6  7  8
+     9 10 11 12 13 14 15
+    16 17 18 19 20 21 22
+    23 24 25 26 27 28 29
+    30 31
+    """
+    for year in range(start_year, end_year + 1):
+        for month in range(1, 13):
+            yield monthCalendarFor(month, year)
+
+def write_calendars(start_year, end_year, out, chunk_size=1 << 20):
+    """Writes every month from start_year through end_year to the text stream
+    out, separated by blank lines like the interactive output. Months are
+    gathered into chunks of about chunk_size characters before each write, so
+    memory use does not grow with the length of the range. Returns the number
+    of months written.
+
+    >>> import io
+    >>> buffer = io.StringIO()
+    >>> write_calendars(2024, 2025, buffer)
+    24
+    >>> buffer.getvalue().count("Su Mo Tu We Th Fr Sa")
+    24
+    """
+    chunk = []
+    size = 0
+    count = 0
+    for calendar in iter_calendars(start_year, end_year):
+        chunk.append(calendar)
+        chunk.append("\n")
+        size += len(calendar) + 1
+        count += 1
+        if size >= chunk_size:
+            out.write("".join(chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        out.write("".join(chunk))
+    return count
+
+def render_years(first_year, last_year):
+    """Returns the text write_calendars would produce for the given years."""
+    return "".join(calendar + "\n" for calendar in iter_calendars(first_year, last_year))
+
+_YEAR_LENGTHS = {}  # (year % CYCLE_YEARS, digits of year) -> length
+
+def year_length(year):
+    """Returns the number of characters write_calendars writes for one year.
+    It depends only on the year's place in the 400-year cycle and on how many
+    digits the year has, so each combination is computed once.
+
+    >>> year_length(2024) == len(render_years(2024, 2024))
+    True
+    """
+    key = (year % CYCLE_YEARS, len(str(year)))
+    length = _YEAR_LENGTHS.get(key)
+    if length is None:
+        length = 0
+        for month in range(1, 13):
+            title = f"{month_name(month)} {year}".center(CALENDAR_WIDTH).rstrip()
+            body = month_layout(startingDayOfWeek(month, year), daysInMonth(month, year))
+            length += len(title) + 1 + len(WEEKDAY_HEADER) + len(body) + (month == 2) + 1
+        _YEAR_LENGTHS[key] = length
+    return length
+
+def _write_block(task):
+    """Process-pool worker: renders one block of years and writes it at its
+    offset in the output file, so only the task and a length cross processes."""
+    path, first_year, last_year, offset = task
+    data = render_years(first_year, last_year).encode("ascii")
+    with open(path, "r+b") as out:
+        out.seek(offset)
+        out.write(data)
+    return len(data)
+
+def write_calendars_parallel(start_year, end_year, path, workers=None, block_years=50):
+    """Like write_calendars, but writes to the file at path, rendering blocks of
+    block_years years on a pool of worker processes. The offset of every block
+    is known in advance from year_length, so each worker writes its block into
+    the file itself and the output is identical to the serial version. Uses no
+    more workers than there are CPUs, and writes serially when that is one.
+    Returns the number of months written.
+
+    >>> import io, os, tempfile
+    >>> serial = io.StringIO()
+    >>> write_calendars(1990, 2030, serial)
+    492
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, "calendars.txt")
+    ...     months = write_calendars_parallel(1990, 2030, path, workers=2, block_years=7)
+    ...     with open(path) as f:
+    ...         months, f.read() == serial.getvalue()
+    (492, True)
+    """
+    blocks = [(first, min(first + block_years - 1, end_year))
+              for first in range(start_year, end_year + 1, block_years)]
+    workers = min(workers or os.cpu_count() or 1, os.cpu_count() or 1, len(blocks))
+    if workers <= 1:
+        with open(path, "w", buffering=1 << 20) as out:
+            return write_calendars(start_year, end_year, out)
+    tasks = []
+    offset = 0
+    for first, last in blocks:
+        tasks.append((path, first, last, offset))
+        offset += sum(year_length(year) for year in range(first, last + 1))
+    with open(path, "wb") as out:
+        out.truncate(offset)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (_, first, last, start), written in zip(tasks, pool.map(_write_block, tasks)):
+            if written != sum(year_length(year) for year in range(first, last + 1)):
+                raise RuntimeError(f"block {first}-{last} was not the expected length")
+    return 12 * max(0, end_year - start_year + 1)
+
+# Archive layout: a small header followed by one fixed-width, NUL-padded
+# record per month, so any month is found by offset arithmetic alone.
+ARCHIVE_MAGIC = b"CAL1"
+ARCHIVE_HEADER = struct.Struct("<4sHHH")  # magic, record width, first year, last year
+
+def archive_record_width(last_year):
+    """Returns the number of bytes needed to hold the longest calendar of any
+    month up to last_year (the longest title has the most year digits)."""
+    title = max(len(f"{month_name(month)} {last_year}".center(CALENDAR_WIDTH).rstrip())
+                for month in range(1, 13))
+    body = max(len(month_layout(start_day, num_days))
+               for start_day in range(7) for num_days in range(28, 32))
+    return title + 1 + len(WEEKDAY_HEADER) + body + 1  # +1 for February's extra line
+
+def build_archive(path, first_year=1, last_year=9999):
+    """Pre-renders every month from first_year through last_year into a
+    fixed-record-width file at path that CalendarArchive can memory-map."""
+    width = archive_record_width(last_year)
+    with open(path, "wb", buffering=1 << 20) as out:
+        out.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, width, first_year, last_year))
+        for calendar in iter_calendars(first_year, last_year):
+            out.write(calendar.encode("ascii").ljust(width, b"\0"))
+
+class CalendarArchive:
+    """Read-only, memory-mapped view of a file written by build_archive.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "calendars.bin")
+    >>> build_archive(path, 2000, 2030)
+    >>> with CalendarArchive(path) as archive:
+    ...     archive.calendar_for(2, 2024) == monthCalendarFor(2, 2024)
+    True
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.record_width, self.first_year, self.last_year = \
+            ARCHIVE_HEADER.unpack_from(self._map)
+        if magic != ARCHIVE_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a calendar archive")
+
+    def calendar_for(self, month, year):
+        """Returns the monthCalendarFor text stored for the given month and year."""
+        if not (1 <= month <= 12 and self.first_year <= year <= self.last_year):
+            raise ValueError(f"{month} {year} is not in the archive")
+        start = ARCHIVE_HEADER.size + ((year - self.first_year) * 12 + month - 1) * self.record_width
+        return self._map[start:start + self.record_width].rstrip(b"\0").decode("ascii")
+
+    def close(self):
+        """Unmaps the archive file."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Returns {point: value} for the nearest-rank percentiles of samples.
+
+    >>> percentiles(range(1, 101))
+    {50: 50, 90: 90, 99: 99}
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {point: None for point in points}
+    return {point: ordered[max(0, -(-point * len(ordered) // 100) - 1)] for point in points}
+
+class CalendarServer:
+    """Asyncio TCP server that answers "month year" lines with monthCalendarFor
+    output. Each response is a header line "OK <length>" (or "ERR <length>")
+    followed by that many bytes, so clients may pipeline many requests on one
+    connection. Rendered months are kept in a bounded LRU cache.
+    """
+    def __init__(self, host="127.0.0.1", port=0, cache_size=4096, latency_samples=100_000):
+        self.host = host
+        self.port = port
+        self.response_for = lru_cache(maxsize=cache_size)(self._render_response)
+        self.latencies = deque(maxlen=latency_samples)  # seconds per request
+        self._server = None
+
+    @staticmethod
+    def _render_response(line):
+        """Returns the encoded response to one request line."""
+        try:
+            month, year = map(int, line.split())
+            if not 1 <= month <= 12:
+                raise ValueError(f"month must be 1-12, not {month}")
+            status, body = b"OK", monthCalendarFor(month, year).encode()
+        except ValueError as error:
+            status, body = b"ERR", str(error).encode()
+        return b"%s %d\n%s" % (status, len(body), body)
+
+    async def _handle(self, reader, writer):
+        """Answers every request line on one connection, in order."""
+        try:
+            while line := await reader.readline():
+                started = time.perf_counter()
+                writer.write(self.response_for(line))
+                self.latencies.append(time.perf_counter() - started)
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Starts listening; the bound port is stored in self.port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Starts the server (if needed) and serves until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        """Stops accepting connections."""
+        self._server.close()
+
+    def latency_percentiles(self):
+        """Returns the 50th/90th/99th percentile request latency in microseconds."""
+        return {point: None if value is None else value * 1e6
+                for point, value in percentiles(self.latencies).items()}
+
+async def load_test(host, port, requests=10_000, pipeline=64, seed=None):
+    """Sends requests random "month year" queries over one connection,
+    keeping up to pipeline of them in flight. Returns the list of round-trip
+    latencies in seconds.
+
+    >>> async def demo():
+    ...     server = CalendarServer()
+    ...     await server.start()
+    ...     latencies = await load_test(server.host, server.port, 200, seed=1)
+    ...     server.close()
+    ...     return len(latencies), len(server.latencies)
+    >>> asyncio.run(demo())
+    (200, 200)
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = deque()
+    latencies = []
+
+    async def read_response():
+        header = await reader.readline()
+        await reader.readexactly(int(header.split()[1]))
+        latencies.append(time.perf_counter() - sent.popleft())
+
+    for _ in range(requests):
+        if len(sent) >= pipeline:
+            await read_response()
+        writer.write(b"%d %d\n" % (rng.randint(1, 12), rng.randint(1, 9999)))
+        sent.append(time.perf_counter())
+    await writer.drain()
+    while sent:
+        await read_response()
+    writer.close()
+    await writer.wait_closed()
+    return latencies
+
+async def _serve_and_load_test(requests, pipeline):
+    """Runs a server on an ephemeral localhost port and load-tests it."""
+    server = CalendarServer()
+    await server.start()
+    started = time.perf_counter()
+    latencies = await load_test(server.host, server.port, requests, pipeline)
+    elapsed = time.perf_counter() - started
+    server.close()
+    return server, latencies, elapsed
+
 # output
 if __name__ == "__main__":
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description="Print monthly calendars.")
+    parser.add_argument("--verify", action="store_true",
+                        help="check the cycle tables against Zeller's congruence for years 1-9999")
+    parser.add_argument("--range", nargs=2, type=int, metavar=("START", "END"),
+                        help="print every month from year START through year END")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the --range calendars to FILE instead of stdout")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="render the --range calendars to --output on up to N worker "
+                             "processes (no more than the number of CPUs)")
+    parser.add_argument("--build-archive", metavar="FILE",
+                        help="pre-render years 1-9999 into a fixed-width archive FILE")
+    parser.add_argument("--archive", metavar="FILE",
+                        help="answer the \"month year\" input from archive FILE")
+    parser.add_argument("--serve", action="store_true",
+                        help="serve \"month year\" requests over TCP on localhost")
+    parser.add_argument("--port", type=int, default=8215,
+                        help="port for --serve (default 8215)")
+    parser.add_argument("--load-test", type=int, metavar="REQUESTS",
+                        help="start a local server and send it REQUESTS pipelined queries")
+    args = parser.parse_args()
+    if args.verify:
+        mismatches = verify_tables()
+        print(f"{len(mismatches)} mismatches for years 1-9999")
+        sys.exit(1 if mismatches else 0)
+    if args.range:
+        start_year, end_year = args.range
+        started = time.perf_counter()
+        if args.workers:
+            if not args.output:
+                parser.error("--workers needs --output FILE")
+            months = write_calendars_parallel(start_year, end_year, args.output, args.workers)
+        else:
+            out = open(args.output, "w", buffering=1 << 20) if args.output else sys.stdout
+            months = write_calendars(start_year, end_year, out)
+            if out is not sys.stdout:
+                out.close()
+        elapsed = time.perf_counter() - started
+        print(f"{months} months in {elapsed:.2f} s ({months / elapsed:,.0f} months/s)",
+              file=sys.stderr)
+        sys.exit(0)
+    if args.serve:
+        server = CalendarServer(port=args.port)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            print(f"server latency (us): {server.latency_percentiles()}", file=sys.stderr)
+        sys.exit(0)
+    if args.load_test:
+        server, latencies, elapsed = asyncio.run(_serve_and_load_test(args.load_test, 64))
+        round_trip = {point: value * 1e6 for point, value in percentiles(latencies).items()}
+        print(f"{len(latencies)} requests in {elapsed:.2f} s "
+              f"({len(latencies) / elapsed:,.0f} requests/s)")
+        print(f"round trip (us): { {p: round(v, 1) for p, v in round_trip.items()} }")
+        print(f"server (us): { {p: round(v, 1) for p, v in server.latency_percentiles().items()} }")
+        print(f"cache: {server.response_for.cache_info()}")
+        sys.exit(0)
+    if args.build_archive:
+        build_archive(args.build_archive)
+        sys.exit(0)
     month, year = map(int, input().split())
-    print(monthCalendarFor(month, year))
- 
-
+    if args.archive:
+        with CalendarArchive(args.archive) as archive:
+            print(archive.calendar_for(month, year))
+    else:
+        print(monthCalendarFor(month, year))
@@ -5,6 +5,9 @@ Professor: Prof. Ordonez
 Date: 2024-10-14 
 """
 from enum import Enum
+from functools import lru_cache
+from numbers import Integral
+import operator
 
 class HalfInning(Enum):
     """
@@ -13,6 +16,41 @@ class HalfInning(Enum):
     TOP = "top"
     BOTTOM = "bottom"
 
+def _announcer_prefix(balls, strikes, outs, half):
+    """
+    Builds the start of the announcer string, up to the inning number.
+    """
+    balls = f"{balls} ball" if balls == 1 else f"{balls} balls"
+    strikes = f"{strikes} strike" if strikes == 1 else f"{strikes} strikes"
+    outs = f"{outs} out" if outs == 1 else f"{outs} outs"
+    half = "bottom" if half == HalfInning.BOTTOM else "top"
+    return f"{balls}, {strikes}, {outs}, {half} of the "
+
+# Announcer prefixes for every count that can occur in a game
+ANNOUNCER_PREFIXES = {(balls, strikes, outs, half): _announcer_prefix(balls, strikes, outs, half)
+                      for balls in range(4) for strikes in range(3) for outs in range(3)
+                      for half in HalfInning}
+
+@lru_cache(maxsize=None)
+def ordinal(number):
+    """
+    Returns the number with its ordinal suffix.
+
+    >>> ordinal(1), ordinal(2), ordinal(3), ordinal(11), ordinal(22), ordinal(113)
+    ('1st', '2nd', '3rd', '11th', '22nd', '113th')
+    """
+    if 10 <= number % 100 <= 20:
+        suffix = "th"
+    elif number % 10 == 1:
+        suffix = "st"
+    elif number % 10 == 2:
+        suffix = "nd"
+    elif number % 10 == 3:
+        suffix = "rd"
+    else:
+        suffix = "th"
+    return f"{number}{suffix}"
+
 class BaseballCounter:
     def __init__(self, balls=0, strikes=0, outs=0, half=HalfInning.TOP, inning=1):
         """
@@ -57,23 +95,10 @@ class BaseballCounter:
         >>> str(bc)
         '3 balls, 2 strikes, 2 outs, bottom of the 9th inning'
         """
-        balls = f"{self.balls} ball" if self.balls == 1 else f"{self.balls} balls"
-        strikes = f"{self.strikes} strike" if self.strikes == 1 else f"{self.strikes} strikes"
-        outs = f"{self.outs} out" if self.outs == 1 else f"{self.outs} outs"
-        half = "bottom" if self.half == HalfInning.BOTTOM else "top"
-        if 10 <= self.inning % 100 <= 20:
-            inning_suffix = "th"
-        else:
-            if self.inning % 10 == 1:
-                inning_suffix = "st"
-            elif self.inning % 10 == 2:
-                inning_suffix = "nd"
-            elif self.inning % 10 == 3:
-                inning_suffix = "rd"
-            else:
-                inning_suffix = "th"
-        inning_str = f"{self.inning}{inning_suffix}"
-        return f"{balls}, {strikes}, {outs}, {half} of the {inning_str} inning"
+        prefix = ANNOUNCER_PREFIXES.get((self.balls, self.strikes, self.outs, self.half))
+        if prefix is None:
+            prefix = _announcer_prefix(self.balls, self.strikes, self.outs, self.half)
+        return prefix + ordinal(self.inning) + " inning"
     
     def ball(self):
         """
@@ -173,7 +198,180 @@ class BaseballCounter:
         self.outs = 0 
         self.half = HalfInning.TOP
         self.inning = 1
-    
+
+
+# A compact counter packs the whole state into one int:
+#     state = inning * 72 + half * 36 + outs * 12 + strikes * 4 + balls
+# with half 0 for TOP and 1 for BOTTOM. The low part (state % 72) has only
+# 72 values, so each event is a table lookup of how much the state changes.
+STATES_PER_INNING = 72
+HALVES = (HalfInning.TOP, HalfInning.BOTTOM)
+
+def _event_deltas(event):
+    """
+    Returns, for each of the 72 low states, how much the packed state changes
+    when the BaseballCounter method named event is applied.
+    """
+    deltas = []
+    for low in range(STATES_PER_INNING):
+        counter = BaseballCounter(low % 4, low // 4 % 3, low // 12 % 3, HALVES[low // 36], 1)
+        getattr(counter, event)()
+        deltas.append(CompactCounter.from_counter(counter).state - (STATES_PER_INNING + low))
+    return tuple(deltas)
+
+class CompactCounter:
+    """
+    A BaseballCounter whose state is a single int and whose events are table
+    lookups. It has the same methods, repr, and str as BaseballCounter, and
+    compares and hashes by state.
+
+    >>> cc = CompactCounter(3, 2, 2, HalfInning.BOTTOM, 9)
+    >>> cc
+    BaseballCounter(3, 2, 2, HalfInning.BOTTOM, 9)
+    >>> str(cc)
+    '3 balls, 2 strikes, 2 outs, bottom of the 9th inning'
+    >>> cc.strike()
+    0
+    >>> cc.balls, cc.outs, cc.half, cc.inning
+    (3, 0, <HalfInning.TOP: 'top'>, 10)
+    >>> CompactCounter.from_counter(cc.to_counter()) == cc
+    True
+    >>> len({CompactCounter(), CompactCounter(0, 0, 0, HalfInning.TOP, 1)})
+    1
+    """
+    __slots__ = ("state",)
+
+    def __init__(self, balls=0, strikes=0, outs=0, half=HalfInning.TOP, inning=1):
+        """
+        Takes the same parameters as BaseballCounter; balls must be 0-3 and
+        strikes and outs 0-2.
+        """
+        if not (0 <= balls <= 3 and 0 <= strikes <= 2 and 0 <= outs <= 2 and inning >= 0):
+            raise ValueError("balls, strikes, or outs out of range for a compact counter")
+        self.state = (inning * STATES_PER_INNING + HALVES.index(half) * 36
+                      + outs * 12 + strikes * 4 + balls)
+
+    @classmethod
+    def from_counter(cls, counter):
+        """
+        Returns a CompactCounter with the same state as a BaseballCounter.
+        """
+        return cls(counter.balls, counter.strikes, counter.outs, counter.half, counter.inning)
+
+    def to_counter(self):
+        """
+        Returns a BaseballCounter with the same state.
+        """
+        return BaseballCounter(self.balls, self.strikes, self.outs, self.half, self.inning)
+
+    @property
+    def balls(self):
+        return self.state % 4
+
+    @property
+    def strikes(self):
+        return self.state // 4 % 3
+
+    @property
+    def outs(self):
+        return self.state // 12 % 3
+
+    @property
+    def half(self):
+        return HALVES[self.state // 36 % 2]
+
+    @property
+    def inning(self):
+        return self.state // STATES_PER_INNING
+
+    def __repr__(self):
+        return f'BaseballCounter({self.balls}, {self.strikes}, {self.outs}, {self.half}, {self.inning})'
+
+    def __str__(self):
+        return announce_state(self.state)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactCounter):
+            return NotImplemented
+        return self.state == other.state
+
+    def __hash__(self):
+        return hash(self.state)
+
+    def ball(self):
+        """
+        Counts a ball, like BaseballCounter.ball.
+        """
+        self.state += BALL_DELTAS[self.state % STATES_PER_INNING]
+        return self.state % 4
+
+    def strike(self):
+        """
+        Counts a strike, like BaseballCounter.strike.
+        """
+        self.state += STRIKE_DELTAS[self.state % STATES_PER_INNING]
+        return self.state // 4 % 3
+
+    def out(self):
+        """
+        Counts an out, like BaseballCounter.out.
+        """
+        self.state += OUT_DELTAS[self.state % STATES_PER_INNING]
+
+    def new_batter(self):
+        """
+        Resets balls and strikes, like BaseballCounter.new_batter.
+        """
+        self.state -= self.state % 12
+
+    def new_game(self):
+        """
+        Resets everything, like BaseballCounter.new_game.
+        """
+        self.state = STATES_PER_INNING
+
+# STATE_PREFIXES[state % 72]: announcer prefix of a packed state
+STATE_PREFIXES = tuple(ANNOUNCER_PREFIXES[(low % 4, low // 4 % 3, low // 12 % 3, HALVES[low // 36])]
+                       for low in range(STATES_PER_INNING))
+
+def announce_state(state):
+    """
+    Returns the announcer string of a packed CompactCounter state.
+
+    >>> announce_state(CompactCounter(1, 0, 2, HalfInning.TOP, 12).state)
+    '1 ball, 0 strikes, 2 outs, top of the 12th inning'
+    """
+    return STATE_PREFIXES[state % STATES_PER_INNING] + ordinal(state // STATES_PER_INNING) + " inning"
+
+def announce_all(counters):
+    """
+    Returns one buffer with the announcer string of each counter on its own
+    line. Counters may be BaseballCounters, CompactCounters, or packed states
+    (any integer type, such as the NumPy integers of a BaseballCounterArray).
+
+    >>> print(announce_all([BaseballCounter(), CompactCounter(3, 2, 1), 72 * 9 + 36]), end="")
+    0 balls, 0 strikes, 0 outs, top of the 1st inning
+    3 balls, 2 strikes, 1 out, top of the 1st inning
+    0 balls, 0 strikes, 0 outs, bottom of the 9th inning
+    """
+    lines = []
+    for counter in counters:
+        lines.append(announce_state(operator.index(counter)) if isinstance(counter, Integral)
+                     else str(counter))
+    lines.append("")
+    return "\n".join(lines)
+
+BALL_DELTAS = _event_deltas("ball")
+STRIKE_DELTAS = _event_deltas("strike")
+OUT_DELTAS = _event_deltas("out")
+
+# Event codes shared by the bulk tools, and EVENT_DELTAS[code * 72 + state % 72],
+# the change in a packed state for each event except NEW_GAME (which resets it).
+EVENTS = ("ball", "strike", "out", "new_batter", "new_game")
+NEW_GAME = 4
+EVENT_DELTAS = (BALL_DELTAS + STRIKE_DELTAS + OUT_DELTAS
+                + tuple(-(low % 12) for low in range(STATES_PER_INNING)))
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
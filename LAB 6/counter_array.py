@@ -0,0 +1,166 @@
+"""
+Program: Baseball counter array
+Description:
+Tracks the counters of many games at once as columns (balls, strikes,
+outs, half, inning), with one entry per game. A batch of (game, event)
+updates is applied with whole-column operations on the packed-state delta
+tables of LAB_6_Final, so the rules are exactly those of BaseballCounter.
+Uses NumPy when it is installed and falls back to array.array otherwise.
+"""
+from array import array
+
+from LAB_6_Final import (BaseballCounter, HALVES, STATES_PER_INNING, EVENTS,
+                         NEW_GAME, EVENT_DELTAS)
+
+try:
+    import numpy as np
+except ImportError:  # fall back to array.array columns and a Python loop
+    np = None
+
+class BaseballCounterArray:
+    """
+    The counters of games games, all starting at the top of the 1st inning.
+    Events are the codes of LAB_6_Final.EVENTS (0 ball, 1 strike, 2 out,
+    3 new batter, 4 new game).
+
+    >>> games = BaseballCounterArray(3)
+    >>> games.apply([0, 0, 0, 0, 2, 1], [0, 0, 0, 0, 1, 2])
+    >>> games.counter(0), games.counter(1), games.counter(2)
+    (BaseballCounter(0, 0, 0, HalfInning.TOP, 1), BaseballCounter(0, 0, 1, HalfInning.TOP, 1), BaseballCounter(0, 1, 0, HalfInning.TOP, 1))
+    """
+    def __init__(self, games):
+        self.games = games
+        if np is not None:
+            self.balls = np.zeros(games, dtype=np.int8)
+            self.strikes = np.zeros(games, dtype=np.int8)
+            self.outs = np.zeros(games, dtype=np.int8)
+            self.half = np.zeros(games, dtype=np.int8)  # 0 top, 1 bottom
+            self.inning = np.ones(games, dtype=np.int64)
+            self._deltas = np.array(EVENT_DELTAS, dtype=np.int64)
+        else:
+            self.balls = array("b", bytes(games))
+            self.strikes = array("b", bytes(games))
+            self.outs = array("b", bytes(games))
+            self.half = array("b", bytes(games))
+            self.inning = array("q", [1]) * games
+
+    def __len__(self):
+        return self.games
+
+    def counter(self, game):
+        """
+        Returns the state of one game as a BaseballCounter.
+        """
+        return BaseballCounter(int(self.balls[game]), int(self.strikes[game]),
+                               int(self.outs[game]), HALVES[self.half[game]],
+                               int(self.inning[game]))
+
+    def apply(self, game_ids, events):
+        """
+        Applies events[i] to game game_ids[i] for every i. Events for the same
+        game are applied in the order given. Nothing is applied if a game id
+        or event code is out of range.
+
+        >>> games = BaseballCounterArray(2)
+        >>> games.apply([0, 1], [0, 7])
+        Traceback (most recent call last):
+        ...
+        ValueError: event codes must be 0 to 4
+        >>> games.apply([0, -1], [0, 0])
+        Traceback (most recent call last):
+        ...
+        ValueError: game ids must be 0 to 1
+        >>> games.counter(0)
+        BaseballCounter(0, 0, 0, HalfInning.TOP, 1)
+        """
+        if np is None:
+            game_ids, events = list(game_ids), list(events)
+            if len(game_ids) != len(events):
+                raise ValueError("game_ids and events must have the same length")
+            self._check(min(game_ids, default=0), max(game_ids, default=0),
+                        min(events, default=0), max(events, default=0))
+            for game, event in zip(game_ids, events):
+                self._apply_one(game, event)
+            return
+        game_ids = np.asarray(game_ids, dtype=np.intp)
+        events = np.asarray(events, dtype=np.int64)
+        if game_ids.shape != events.shape:
+            raise ValueError("game_ids and events must have the same length")
+        if not len(game_ids):
+            return
+        self._check(game_ids.min(), game_ids.max(), events.min(), events.max())
+        # rank[i]: how many earlier events in the batch belong to the same game;
+        # all events of one rank touch distinct games, so each rank is one step
+        order = np.argsort(game_ids, kind="stable")
+        sorted_ids = game_ids[order]
+        positions = np.arange(len(sorted_ids))
+        group_starts = np.maximum.accumulate(
+            np.where(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]], positions, 0))
+        rank = np.empty_like(positions)
+        rank[order] = positions - group_starts
+        by_rank = np.argsort(rank, kind="stable")
+        bounds = np.cumsum(np.bincount(rank))
+        for start, stop in zip(np.r_[0, bounds[:-1]], bounds):
+            step = by_rank[start:stop]
+            self._apply_step(game_ids[step], events[step])
+
+    def _check(self, lowest_game, highest_game, lowest_event, highest_event):
+        """
+        Raises ValueError unless the game ids and event codes are in range.
+        """
+        if lowest_event < 0 or highest_event > NEW_GAME:
+            raise ValueError(f"event codes must be 0 to {NEW_GAME}")
+        if lowest_game < 0 or highest_game >= self.games:
+            raise ValueError(f"game ids must be 0 to {self.games - 1}")
+
+    def _apply_step(self, games, events):
+        """
+        Applies one event to each of the distinct games with column operations.
+        """
+        low = (self.half[games].astype(np.int64) * 36 + self.outs[games] * 12
+               + self.strikes[games] * 4 + self.balls[games])
+        state = self.inning[games] * STATES_PER_INNING + low
+        delta = self._deltas[np.minimum(events, NEW_GAME - 1) * STATES_PER_INNING + low]
+        state = np.where(events == NEW_GAME, STATES_PER_INNING, state + delta)
+        self.balls[games] = state % 4
+        self.strikes[games] = state // 4 % 3
+        self.outs[games] = state // 12 % 3
+        self.half[games] = state // 36 % 2
+        self.inning[games] = state // STATES_PER_INNING
+
+    def _apply_one(self, game, event):
+        """
+        Applies one event to one game (the fallback without NumPy).
+        """
+        if event == NEW_GAME:
+            state = STATES_PER_INNING
+        else:
+            low = (self.half[game] * 36 + self.outs[game] * 12
+                   + self.strikes[game] * 4 + self.balls[game])
+            state = (self.inning[game] * STATES_PER_INNING + low
+                     + EVENT_DELTAS[event * STATES_PER_INNING + low])
+        self.balls[game] = state % 4
+        self.strikes[game] = state // 4 % 3
+        self.outs[game] = state // 12 % 3
+        self.half[game] = state // 36 % 2
+        self.inning[game] = state // STATES_PER_INNING
+
+def _check_against_counters(games=50, updates=20_000, seed=1):
+    """
+    Applies random batches to a BaseballCounterArray and to one
+    BaseballCounter per game, and returns whether every game agrees.
+
+    >>> _check_against_counters()
+    True
+    """
+    import random
+    rng = random.Random(seed)
+    tracked = BaseballCounterArray(games)
+    counters = [BaseballCounter() for _ in range(games)]
+    for _ in range(updates // 500):
+        ids = [rng.randrange(games) for _ in range(500)]
+        events = rng.choices(range(len(EVENTS)), weights=[40, 40, 15, 5, 0.1], k=500)
+        tracked.apply(ids, events)
+        for game, event in zip(ids, events):
+            getattr(counters[game], EVENTS[event])()
+    return all(repr(tracked.counter(game)) == repr(counters[game]) for game in range(games))
@@ -0,0 +1,185 @@
+"""
+Program: Baseball game simulator
+Description:
+Simulates 9-inning games pitch by pitch under the BaseballCounter rules.
+Each pitch is a ball, a strike, an out in play, or a hit, with configurable
+probabilities. A walk, a strikeout, an out in play, or a hit ends the at-bat
+and brings up a new batter. The counter state is the packed int of
+CompactCounter, advanced with its delta tables. Games are split into chunks
+with their own seeds and spread over a process pool. The results are
+histograms of pitches per at-bat, per half inning, and per game.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import random
+import sys
+import time
+
+from LAB_6_Final import STATES_PER_INNING, EVENT_DELTAS
+
+BALL, STRIKE, OUT, NEW_BATTER = 0, 1, 2, 3
+GAME_OVER = 10 * STATES_PER_INNING  # top of the 10th inning
+CHUNK_GAMES = 500
+
+# default per-pitch probabilities: ball, strike, out in play, hit
+DEFAULT_PROBABILITIES = (0.35, 0.45, 0.13, 0.07)
+
+def new_stats():
+    """
+    Returns empty simulation statistics.
+    """
+    return {"games": 0, "pitches_per_at_bat": Counter(),
+            "pitches_per_half_inning": Counter(), "pitches_per_game": Counter()}
+
+def merge_stats(total, stats):
+    """
+    Adds stats into total and returns total.
+    """
+    total["games"] += stats["games"]
+    for key in ("pitches_per_at_bat", "pitches_per_half_inning", "pitches_per_game"):
+        total[key].update(stats[key])
+    return total
+
+def check_probabilities(probabilities):
+    """
+    Raises ValueError unless probabilities are 4 non-negative numbers that
+    add up to 1 and outs can happen, so that every game ends.
+
+    >>> check_probabilities((0.5, 0, 0, 0.5))
+    Traceback (most recent call last):
+    ...
+    ValueError: strikes and outs in play can't both have probability 0: no game would end
+    """
+    if len(probabilities) != 4 or abs(sum(probabilities) - 1) > 1e-9 or min(probabilities) < 0:
+        raise ValueError("probabilities must be 4 non-negative numbers that add up to 1")
+    _, p_strike, p_out, _ = probabilities
+    if p_strike + p_out <= 0:
+        raise ValueError("strikes and outs in play can't both have probability 0: no game would end")
+
+def simulate_games(games, rng, probabilities=DEFAULT_PROBABILITIES, stats=None):
+    """
+    Plays games games with rng and records them in stats.
+
+    >>> stats = simulate_games(20, random.Random(9))
+    >>> stats["games"], sum(stats["pitches_per_half_inning"].values())
+    (20, 360)
+    >>> sum(stats["pitches_per_game"].elements()) == sum(stats["pitches_per_at_bat"].elements())
+    True
+    """
+    check_probabilities(probabilities)
+    if stats is None:
+        stats = new_stats()
+    p_ball, p_strike, p_out, _ = probabilities
+    ball_below = p_ball
+    strike_below = ball_below + p_strike
+    out_below = strike_below + p_out
+    deltas = EVENT_DELTAS
+    per_at_bat = stats["pitches_per_at_bat"]
+    per_half = stats["pitches_per_half_inning"]
+    per_game = stats["pitches_per_game"]
+    draw = rng.random
+    for _ in range(games):
+        state = STATES_PER_INNING
+        half_inning = state // 36
+        game_pitches = half_pitches = at_bat_pitches = 0
+        while state < GAME_OVER:
+            r = draw()
+            at_bat_pitches += 1
+            if r < ball_below:
+                state += deltas[BALL * STATES_PER_INNING + state % STATES_PER_INNING]
+                done = state % 4 == 0  # the 4th ball is a walk
+            elif r < strike_below:
+                state += deltas[STRIKE * STATES_PER_INNING + state % STATES_PER_INNING]
+                done = state // 4 % 3 == 0  # the 3rd strike is an out
+            elif r < out_below:
+                state += deltas[OUT * STATES_PER_INNING + state % STATES_PER_INNING]
+                done = True
+            else:
+                done = True
+            if done:
+                state += deltas[NEW_BATTER * STATES_PER_INNING + state % STATES_PER_INNING]
+                per_at_bat[at_bat_pitches] += 1
+                half_pitches += at_bat_pitches
+                at_bat_pitches = 0
+                if state // 36 != half_inning:
+                    per_half[half_pitches] += 1
+                    game_pitches += half_pitches
+                    half_pitches = 0
+                    half_inning = state // 36
+        per_game[game_pitches] += 1
+        stats["games"] += 1
+    return stats
+
+def _simulate_chunk(task):
+    """
+    Process-pool worker: plays one chunk of games from its own seed.
+    """
+    games, seed, probabilities = task
+    return simulate_games(games, random.Random(seed), probabilities)
+
+def simulate(games, workers=None, seed=None, probabilities=DEFAULT_PROBABILITIES):
+    """
+    Plays games games on a pool of workers and merges their statistics. With
+    a seed the result is the same for any number of workers.
+
+    >>> simulate(1200, workers=2, seed=3) == simulate(1200, workers=1, seed=3)
+    True
+    """
+    check_probabilities(probabilities)
+    seeds = random.Random(seed) if seed is not None else random.SystemRandom()
+    tasks = [(min(CHUNK_GAMES, games - start), seeds.getrandbits(64), probabilities)
+             for start in range(0, games, CHUNK_GAMES)]
+    total = new_stats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(_simulate_chunk, tasks):
+            merge_stats(total, stats)
+    return total
+
+def mean(histogram):
+    """
+    Returns the mean of a Counter histogram, or None if it is empty.
+
+    >>> mean(Counter({2: 1, 4: 3}))
+    3.5
+    >>> print(mean(Counter()))
+    None
+    """
+    if not histogram:
+        return None
+    return sum(value * count for value, count in histogram.items()) / sum(histogram.values())
+
+def print_summary(stats, elapsed, out=sys.stdout):
+    """
+    Prints the means and ranges of the histograms and the throughput.
+    """
+    games = stats["games"]
+    print(f"{games} games in {elapsed:.2f} s ({games / elapsed:,.0f} games/s)", file=out)
+    if not games:
+        return
+    for key in ("pitches_per_at_bat", "pitches_per_half_inning", "pitches_per_game"):
+        histogram = stats[key]
+        print(f"{key.replace('_', ' ')}: mean {mean(histogram):.2f}, "
+              f"min {min(histogram)}, max {max(histogram)}", file=out)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulate baseball games pitch by pitch.")
+    parser.add_argument("--games", type=int, default=2430, help="default: one season")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--probabilities", type=float, nargs=4, default=DEFAULT_PROBABILITIES,
+                        metavar=("BALL", "STRIKE", "OUT", "HIT"))
+    parser.add_argument("--histograms", action="store_true", help="print the full histograms")
+    args = parser.parse_args()
+    try:
+        check_probabilities(args.probabilities)
+    except ValueError as error:
+        parser.error(str(error))
+    started = time.perf_counter()
+    stats = simulate(args.games, args.workers, args.seed, tuple(args.probabilities))
+    print_summary(stats, time.perf_counter() - started)
+    if args.histograms:
+        for key in ("pitches_per_at_bat", "pitches_per_half_inning", "pitches_per_game"):
+            print(key)
+            for value, count in sorted(stats[key].items()):
+                print(f"  {value:4}: {count}")
@@ -0,0 +1,179 @@
+"""
+Program: Pitch-event replay
+Description:
+Replays long pitch-by-pitch event logs through the BaseballCounter rules.
+Events are read in large chunks and applied to a CompactCounter state with
+table lookups, so nothing is allocated per event. Two input formats:
+  * text: one letter per event, b(all) s(trike) o(ut) n(ew batter)
+    g (new game); whitespace and commas are ignored;
+  * binary: one byte per event, 0-4 in the same order, memory-mapped.
+The replay can write a snapshot every N events or one summary line per
+half inning, and reports events per second on stderr.
+"""
+import mmap
+import sys
+import time
+
+from LAB_6_Final import CompactCounter, STATES_PER_INNING, EVENTS, NEW_GAME, EVENT_DELTAS
+
+TEXT_EVENTS = b"bsong"
+TEXT_TO_CODE = bytes.maketrans(TEXT_EVENTS, bytes(range(len(EVENTS))))
+TEXT_IGNORED = b" \t\r\n,"
+BINARY_EVENTS = bytes(range(len(EVENTS)))
+CHUNK_SIZE = 1 << 20
+
+def encode_events(names):
+    """
+    Returns the binary (one byte per event) form of a sequence of event names.
+
+    >>> encode_events(["ball", "strike", "new_game"])
+    b'\\x00\\x01\\x04'
+    """
+    return bytes(EVENTS.index(name) for name in names)
+
+def text_chunks(f, chunk_size=CHUNK_SIZE):
+    """
+    Yields the events of a text log opened in binary mode as chunks of
+    event codes.
+
+    >>> import io
+    >>> list(text_chunks(io.BytesIO(b"b s,o n g")))
+    [b'\\x00\\x01\\x02\\x03\\x04']
+    >>> list(text_chunks(io.BytesIO(b"bs\\x01o")))
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown event '\\x01' in text log
+    """
+    while chunk := f.read(chunk_size):
+        unknown = chunk.translate(None, TEXT_IGNORED + TEXT_EVENTS)
+        if unknown:
+            raise ValueError(f"unknown event {chr(unknown[0])!r} in text log")
+        yield chunk.translate(TEXT_TO_CODE, TEXT_IGNORED)
+
+def binary_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Yields the events of a binary log as chunks of a memory map.
+
+    >>> import os, tempfile
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, "bad.bin")
+    ...     with open(path, "wb") as f:
+    ...         _ = f.write(b"\\x00\\x01x")
+    ...     list(binary_chunks(path))
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown event byte 0x78 at offset 2 in binary log
+    """
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            return  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as events:
+            for start in range(0, len(events), chunk_size):
+                chunk = events[start:start + chunk_size]
+                if chunk.translate(None, BINARY_EVENTS):
+                    offset, bad = next((i, code) for i, code in enumerate(chunk)
+                                       if code >= len(EVENTS))
+                    raise ValueError(f"unknown event byte 0x{bad:02x} at offset "
+                                     f"{start + offset} in binary log")
+                yield chunk
+
+def replay(chunks, counter=None, out=None, snapshot_every=0, innings=False):
+    """
+    Applies every event in chunks to counter (a new CompactCounter by
+    default) and returns (counter, number of events). If out is given, writes
+    repr(counter) after every snapshot_every events, or, with innings, one
+    "game<TAB>half<TAB>inning<TAB>events" line for each finished half inning.
+
+    >>> import io
+    >>> log = b"bbbb sss o sss sss g b"
+    >>> counter, events = replay(text_chunks(io.BytesIO(log)))
+    >>> counter, events
+    (BaseballCounter(1, 0, 0, HalfInning.TOP, 1), 16)
+    >>> out = io.StringIO()
+    >>> _ = replay(text_chunks(io.BytesIO(log)), out=out, innings=True)
+    >>> out.getvalue()
+    '1\\ttop\\t1\\t11\\n'
+    >>> replay(text_chunks(io.BytesIO(log)), innings=True)
+    Traceback (most recent call last):
+    ...
+    ValueError: innings and snapshot_every need an out to write to
+    """
+    if out is None and (innings or snapshot_every):
+        raise ValueError("innings and snapshot_every need an out to write to")
+    deltas = EVENT_DELTAS  # local name for the inner loops
+    if counter is None:
+        counter = CompactCounter()
+    state = counter.state
+    events = 0
+    if innings:
+        game = 1
+        half_inning = state // 36
+        count = 0
+        for chunk in chunks:
+            for code in chunk:
+                count += 1
+                if code == NEW_GAME:
+                    state = STATES_PER_INNING
+                    game += 1
+                    half_inning = 2
+                    count = 0
+                    continue
+                state += deltas[code * STATES_PER_INNING + state % STATES_PER_INNING]
+                if state // 36 != half_inning:
+                    out.write(f"{game}\t{'bottom' if half_inning % 2 else 'top'}\t"
+                              f"{half_inning // 2}\t{count}\n")
+                    half_inning = state // 36
+                    count = 0
+            events += len(chunk)
+    elif snapshot_every:
+        for chunk in chunks:
+            for code in chunk:
+                if code == NEW_GAME:
+                    state = STATES_PER_INNING
+                else:
+                    state += deltas[code * STATES_PER_INNING + state % STATES_PER_INNING]
+                events += 1
+                if events % snapshot_every == 0:
+                    counter.state = state
+                    out.write(f"{events}\t{counter!r}\n")
+    else:
+        for chunk in chunks:
+            for code in chunk:
+                if code == NEW_GAME:
+                    state = STATES_PER_INNING
+                else:
+                    state += deltas[code * STATES_PER_INNING + state % STATES_PER_INNING]
+            events += len(chunk)
+    counter.state = state
+    return counter, events
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a pitch-event log through BaseballCounter.")
+    parser.add_argument("log", help="event log to replay ('-' for text on stdin)")
+    parser.add_argument("--binary", action="store_true",
+                        help="the log is one byte (0-4) per event")
+    parser.add_argument("--snapshot-every", type=int, default=0, metavar="N",
+                        help="write the counter after every N events")
+    parser.add_argument("--innings", action="store_true",
+                        help="write one summary line per half inning")
+    parser.add_argument("--output", metavar="FILE", help="write results to FILE instead of stdout")
+    args = parser.parse_args()
+    out = open(args.output, "w", buffering=CHUNK_SIZE) if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        if args.binary:
+            chunks = binary_chunks(args.log)
+            counter, events = replay(chunks, out=out, snapshot_every=args.snapshot_every,
+                                     innings=args.innings)
+        else:
+            with (open(args.log, "rb") if args.log != "-" else sys.stdin.buffer) as f:
+                counter, events = replay(text_chunks(f), out=out,
+                                         snapshot_every=args.snapshot_every, innings=args.innings)
+    except ValueError as error:
+        sys.exit(f"{args.log}: {error}")
+    elapsed = time.perf_counter() - started
+    print(f"final: {counter!r}", file=out)
+    if out is not sys.stdout:
+        out.close()
+    print(f"{events} events in {elapsed:.2f} s ({events / elapsed:,.0f} events/s)", file=sys.stderr)
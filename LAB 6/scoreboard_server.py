@@ -0,0 +1,283 @@
+"""
+Program: Scoreboard server
+Description:
+An asyncio server that holds named counters and broadcasts their changes.
+The protocol is one text line per message:
+  * "<event> <name>" (event is ball, strike, out, new_batter or new_game)
+    applies the event to counter name, creating it on first use;
+  * "GET <name>" answers with the announcer string of the counter;
+  * "SUB" turns the connection into a subscriber. It is answered with "OK"
+    once registered, followed by "<name> <seq> <state>" lines: the
+    counter's packed CompactCounter state after its seq-th event, starting
+    with every existing counter.
+Anything else is answered with "ERR <line>".
+Each subscriber keeps only the newest state of each counter until it can be
+sent, so a slow subscriber sees coalesced updates and never blocks the
+producers or the other subscribers.
+"""
+import asyncio
+import sys
+import time
+
+from LAB_6_Final import CompactCounter, EVENTS, announce_state
+
+class Subscriber:
+    """
+    The updates waiting to be sent to one subscriber connection.
+    """
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = {}  # name -> (seq, state), newest only
+        self.wake = asyncio.Event()
+
+    def publish(self, name, seq, state):
+        """
+        Queues the newest state of a counter, replacing any unsent one.
+        """
+        self.pending[name] = (seq, state)
+        self.wake.set()
+
+    async def run(self):
+        """
+        Sends pending updates until the connection closes.
+        """
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            pending, self.pending = self.pending, {}
+            self.writer.write("".join(f"{name} {seq} {state}\n"
+                                      for name, (seq, state) in pending.items()).encode())
+            await self.writer.drain()
+
+class ScoreboardServer:
+    """
+    Holds named CompactCounters and broadcasts their state to subscribers.
+
+    >>> async def demo():
+    ...     server = ScoreboardServer()
+    ...     await server.start()
+    ...     reader, writer = await asyncio.open_connection(server.host, server.port)
+    ...     writer.write(b"\\xff\\n")
+    ...     error = await reader.readline()
+    ...     writer.write(b"SUB\\n")
+    ...     ok = await reader.readline()  # registered: no update can be missed
+    ...     server.apply("ball", "cubs")
+    ...     server.apply("ball", "cubs")
+    ...     line = await reader.readline()
+    ...     writer.close()
+    ...     await server.close()
+    ...     return error, ok, line, str(server.counters["cubs"])
+    >>> asyncio.run(demo())
+    (b"ERR '\\xef\\xbf\\xbd'\\n", b'OK\\n', b'cubs 2 74\\n', '2 balls, 0 strikes, 0 outs, top of the 1st inning')
+    """
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.counters = {}
+        self.seqs = {}
+        self.subscribers = set()
+        self._connections = {}  # handler task -> writer
+        self._server = None
+
+    def apply(self, event, name):
+        """
+        Applies event to counter name and publishes the new state.
+        """
+        if event not in EVENTS:
+            raise ValueError(f"unknown event {event!r}")
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = CompactCounter()
+        getattr(counter, event)()
+        seq = self.seqs[name] = self.seqs.get(name, 0) + 1
+        for subscriber in self.subscribers:
+            subscriber.publish(name, seq, counter.state)
+
+    async def _handle(self, reader, writer):
+        """
+        Serves one connection: a stream of commands, or a subscriber.
+        """
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while line := await reader.readline():
+                text = line.decode(errors="replace")
+                words = text.split()
+                if words == ["SUB"]:
+                    await self._subscribe(reader, writer)
+                    return
+                if len(words) == 2 and words[0] == "GET":
+                    counter = self.counters.get(words[1])
+                    writer.write(f"{announce_state(counter.state) if counter else 'unknown'}\n".encode())
+                elif len(words) == 2 and words[0] in EVENTS:
+                    self.apply(*words)
+                else:
+                    writer.write(f"ERR {text.strip()!r}\n".encode())
+                # a client that sends GETs without reading the replies
+                # must not make the server buffer them without limit
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def _subscribe(self, reader, writer):
+        """
+        Registers a subscriber, acknowledges it, and sends it every counter,
+        then its updates until it disconnects.
+        """
+        subscriber = Subscriber(writer)
+        for name, counter in self.counters.items():
+            subscriber.publish(name, self.seqs[name], counter.state)
+        self.subscribers.add(subscriber)
+        writer.write(b"OK\n")
+        sending = asyncio.create_task(subscriber.run())
+        closed = asyncio.create_task(reader.read())  # subscribers send nothing more
+        try:
+            await asyncio.wait({sending, closed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.subscribers.discard(subscriber)
+            sending.cancel()
+            closed.cancel()
+            await asyncio.gather(sending, closed, return_exceptions=True)
+
+    async def start(self):
+        """
+        Starts listening; the bound port is stored in self.port.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Starts the server (if needed) and serves until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops accepting connections, closes the open ones, and waits for
+        their handlers to finish.
+        """
+        self._server.close()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+def percentiles(samples, points=(50, 90, 99, 99.9)):
+    """
+    Returns {point: value} for the nearest-rank percentiles of samples.
+
+    >>> percentiles(range(1, 1001))
+    {50: 500, 90: 900, 99: 990, 99.9: 999}
+    >>> percentiles([])
+    {50: None, 90: None, 99: None, 99.9: None}
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {point: None for point in points}
+    return {point: ordered[max(0, int(-(-point * len(ordered) // 100)) - 1)] for point in points}
+
+async def load_test(host, port, rate=5000, seconds=2.0, counters=100, subscribers=4):
+    """
+    Sends events for counters counters at about rate events per second for
+    seconds seconds, and measures how long each event takes to reach every
+    subscriber. Returns (events sent, list of latencies in seconds).
+    """
+    sent_at = {}  # (name, seq) -> send time
+    latencies = []
+    names = [f"game{i}" for i in range(counters)]
+    seqs = dict.fromkeys(names, 0)
+
+    async def subscribe(registered):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"SUB\n")
+            await writer.drain()
+            if await reader.readline() != b"OK\n":
+                raise ConnectionError("subscription was not acknowledged")
+        except Exception as error:
+            registered.set_exception(error)
+            return
+        registered.set_result(None)
+        delivered = {}
+        try:
+            while line := await reader.readline():
+                name, seq, _ = line.split()
+                name, seq = name.decode(), int(seq)
+                now = time.perf_counter()
+                # a coalesced update delivers every earlier event of the counter too
+                for earlier in range(delivered.get(name, 0) + 1, seq + 1):
+                    if (name, earlier) in sent_at:
+                        latencies.append(now - sent_at[name, earlier])
+                delivered[name] = seq
+        finally:
+            writer.close()
+
+    loop = asyncio.get_running_loop()
+    registered = [loop.create_future() for _ in range(subscribers)]
+    tasks = [asyncio.create_task(subscribe(done)) for done in registered]
+    await asyncio.gather(*registered)
+    reader, writer = await asyncio.open_connection(host, port)
+    batch = max(1, rate // 100)
+    sent = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        now = time.perf_counter()
+        for _ in range(batch):
+            name = names[sent % counters]
+            seqs[name] += 1
+            sent_at[name, seqs[name]] = now
+            writer.write(f"{EVENTS[sent % 3]} {name}\n".encode())
+            sent += 1
+        await writer.drain()
+        await asyncio.sleep(max(0.0, started + sent / rate - time.perf_counter()))
+    await asyncio.sleep(0.5)  # let the last updates arrive
+    writer.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return sent, latencies
+
+async def _serve_and_load_test(**options):
+    """
+    Runs a server on an ephemeral localhost port and load-tests it.
+    """
+    server = ScoreboardServer()
+    await server.start()
+    result = await load_test(server.host, server.port, **options)
+    await server.close()
+    return result
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Pub/sub scoreboard server for BaseballCounters.")
+    parser.add_argument("--port", type=int, default=8216, help="port for --serve (default 8216)")
+    parser.add_argument("--serve", action="store_true", help="serve on localhost")
+    parser.add_argument("--load-test", action="store_true",
+                        help="start a local server and measure end-to-end latency")
+    parser.add_argument("--rate", type=int, default=5000, help="events per second for --load-test")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--counters", type=int, default=100)
+    args = parser.parse_args()
+    if args.serve:
+        try:
+            asyncio.run(ScoreboardServer(port=args.port).serve_forever())
+        except KeyboardInterrupt:
+            pass
+    elif args.load_test:
+        sent, latencies = asyncio.run(_serve_and_load_test(
+            rate=args.rate, seconds=args.seconds, counters=args.counters,
+            subscribers=args.subscribers))
+        print(f"{sent} events, {len(latencies)} deliveries to {args.subscribers} subscribers")
+        print("latency (ms):", {point: None if value is None else round(value * 1000, 3)
+                                for point, value in percentiles(latencies).items()})
+    else:
+        parser.print_help(sys.stderr)
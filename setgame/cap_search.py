@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Program: Set cap search
+Description:
+Enumerates the maximal set-free collections of cards ("complete caps") of a
+chosen minimum size and sorts them into classes up to the symmetry of the
+game (the affine group of the 4-attribute space over {0, 1, 2}).
+
+Cards are the indices 0..80 of set_game_logic, and a collection is an
+81-bit mask. Three cards form a set exactly when they lie on a line of that
+space, so:
+  * adding a card forbids, for each card already chosen, the card that would
+    complete a set with both; the forbidden cards are kept as a bitmask;
+  * a maximal set-free collection spans the whole space, so it contains 5
+    affinely independent cards, and an affine map can send them to the cards
+    0, 1, 3, 9, 27. The search therefore only looks at collections that
+    contain those 5 cards;
+  * branches that can no longer reach the minimum size are cut off.
+The search is split into work units (fixed prefixes of cards to add) that
+are checkpointed to a JSON file, so a long run can be stopped and resumed.
+"""
+import json
+import os
+import sys
+import time
+
+from set_game_logic import CARDS, THIRD
+
+ALL_CARDS = (1 << 81) - 1
+BASIS = (0, 1, 3, 9, 27)  # origin and the 4 unit vectors
+BASIS_MASK = sum(1 << point for point in BASIS)
+
+# FORBIDS[p][q]: bit of the card that completes a set with cards p and q
+FORBIDS = [[1 << THIRD[p * 81 + q] for q in range(81)] for p in range(81)]
+
+def _digits(point):
+    '''Returns the base-3 digits of a card index, most significant first.'''
+    return (point // 27, point // 9 % 3, point // 3 % 3, point % 3)
+
+def _from_digits(digits):
+    '''Inverse of _digits.'''
+    return ((digits[0] * 3 + digits[1]) * 3 + digits[2]) * 3 + digits[3]
+
+# ADD[a][b] and SUB[a][b]: digit-wise sum and difference of two cards mod 3
+ADD = [[_from_digits([(x + y) % 3 for x, y in zip(_digits(a), _digits(b))])
+        for b in range(81)] for a in range(81)]
+SUB = [[_from_digits([(x - y) % 3 for x, y in zip(_digits(a), _digits(b))])
+        for b in range(81)] for a in range(81)]
+DOUBLE = [ADD[a][a] for a in range(81)]
+
+def points(mask):
+    '''Returns the card indices in a bitmask, in increasing order.
+    >>> points(0b101001)
+    [0, 3, 5]
+    '''
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+    return result
+
+def is_cap(mask):
+    '''Determines whether the cards in mask contain no set.
+    >>> is_cap(BASIS_MASK), is_cap(0b111)
+    (True, False)
+    '''
+    chosen = points(mask)
+    for i, p in enumerate(chosen):
+        for q in chosen[i + 1:]:
+            if FORBIDS[p][q] & mask:
+                return False
+    return True
+
+def forbidden_by(mask):
+    '''Returns the mask of cards that complete a set with two cards of mask.'''
+    chosen = points(mask)
+    forbidden = 0
+    for i, p in enumerate(chosen):
+        row = FORBIDS[p]
+        for q in chosen[i + 1:]:
+            forbidden |= row[q]
+    return forbidden
+
+def cover_profile(mask):
+    '''Returns a symmetry invariant of a cap: the sorted numbers of pairs of
+    cards in the cap that each card outside it completes a set with.
+    '''
+    counts = [0] * 81
+    chosen = points(mask)
+    for i, p in enumerate(chosen):
+        for q in chosen[i + 1:]:
+            counts[THIRD[p * 81 + q]] += 1
+    return tuple(sorted(counts[x] for x in range(81) if not mask >> x & 1))
+
+ALL_DIGITS = [_digits(y) for y in range(81)]
+
+def _image(origin, steps, digits):
+    '''Returns origin + sum of digits[i] * steps[i] (digit-wise mod 3).'''
+    image = origin
+    for digit, step in zip(digits, steps):
+        if digit == 1:
+            image = ADD[image][step]
+        elif digit == 2:
+            image = ADD[image][DOUBLE[step]]
+    return image
+
+def equivalent(mask, rep):
+    '''Determines whether some affine map sends cap rep onto cap mask. rep
+    must contain the cards of BASIS; every map sending BASIS to 5 cards
+    q0..q4 of mask is tried.
+    >>> equivalent(BASIS_MASK | 1 << 4, BASIS_MASK | 1 << 10)
+    True
+    >>> equivalent(BASIS_MASK | 1 << 4, BASIS_MASK | 1 << 80)
+    False
+    '''
+    if mask.bit_count() != rep.bit_count():
+        return False
+    cap = points(mask)
+    others = [_digits(y) for y in points(rep & ~BASIS_MASK)]
+    for q0 in cap:
+        for q1 in cap:
+            if q1 == q0:
+                continue
+            for q2 in cap:
+                if q2 in (q0, q1):
+                    continue
+                for q3 in cap:
+                    if q3 in (q0, q1, q2):
+                        continue
+                    for q4 in cap:
+                        if q4 in (q0, q1, q2, q3):
+                            continue
+                        # digits of a card are its coordinates along 27, 9, 3, 1
+                        steps = (SUB[q4][q0], SUB[q3][q0], SUB[q2][q0], SUB[q1][q0])
+                        if all(mask >> _image(q0, steps, digits) & 1 for digits in others) \
+                                and len({_image(q0, steps, digits) for digits in ALL_DIGITS}) == 81:
+                            return True
+    return False
+
+class CapSearch:
+    '''Depth-first search for maximal caps of at least min_size cards that
+    contain the cards of BASIS. The full search for min_size=20 visits about
+    10^8 nodes (a few minutes) and finds 456 caps, all in one class.
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'caps.json')
+    >>> search = CapSearch(min_size=20, checkpoint=path)
+    >>> len(search.units), search.units[570]
+    (1905, (17, 23))
+    >>> search.run_unit(570)
+    >>> search.save()
+    >>> resumed = CapSearch(min_size=20, checkpoint=path)
+    >>> resumed.resume()
+    >>> resumed.done, len(resumed.caps), len(resumed.classes())
+    ({570}, 6, 1)
+    >>> all(is_cap(cap) and cap | forbidden_by(cap) == ALL_CARDS for cap in resumed.caps)
+    True
+    '''
+    def __init__(self, min_size=20, split_depth=2, checkpoint=None):
+        self.min_size = min_size
+        self.split_depth = split_depth
+        self.checkpoint = checkpoint
+        self.caps = []        # masks of the maximal caps found
+        self.nodes = 0        # search nodes visited
+        self.done = set()     # indices of finished work units
+        self.units = list(self._prefixes())
+
+    def _prefixes(self):
+        '''Yields the work units: tuples of up to split_depth cards to add to
+        BASIS, in search order.'''
+        stack = [((), BASIS_MASK, forbidden_by(BASIS_MASK), 0)]
+        while stack:
+            prefix, mask, forbidden, start = stack.pop()
+            candidates = ALL_CARDS & ~(mask | forbidden) >> start << start
+            if len(prefix) == self.split_depth or not candidates:
+                yield prefix
+                continue
+            if mask.bit_count() + candidates.bit_count() < self.min_size:
+                continue
+            chosen = points(mask)
+            for p in reversed(points(candidates)):
+                row = FORBIDS[p]
+                added = 0
+                for q in chosen:
+                    added |= row[q]
+                stack.append((prefix + (p,), mask | 1 << p, forbidden | added, p + 1))
+
+    def _search(self, chosen, mask, forbidden, start):
+        '''Extends the cap chosen (mask) with cards numbered start or higher.'''
+        self.nodes += 1
+        free = ALL_CARDS & ~(mask | forbidden)
+        if not free:
+            if len(chosen) >= self.min_size:
+                self.caps.append(mask)
+            return
+        candidates = free >> start << start
+        if len(chosen) + candidates.bit_count() < self.min_size:
+            return
+        while candidates:
+            low = candidates & -candidates
+            candidates ^= low
+            p = low.bit_length() - 1
+            row = FORBIDS[p]
+            added = 0
+            for q in chosen:
+                added |= row[q]
+            chosen.append(p)
+            self._search(chosen, mask | low, forbidden | added, p + 1)
+            chosen.pop()
+
+    def run_unit(self, index):
+        '''Searches every extension of work unit index.'''
+        mask = BASIS_MASK
+        for p in self.units[index]:
+            mask |= 1 << p
+        start = self.units[index][-1] + 1 if self.units[index] else 0
+        self._search(points(mask), mask, forbidden_by(mask), start)
+        self.done.add(index)
+
+    def run(self, progress=sys.stderr, interval=10.0):
+        '''Runs every unfinished work unit, saving a checkpoint and printing a
+        progress line at most every interval seconds.'''
+        started = last_report = time.perf_counter()
+        nodes_before = self.nodes
+        for index in range(len(self.units)):
+            if index in self.done:
+                continue
+            self.run_unit(index)
+            now = time.perf_counter()
+            if now - last_report >= interval:
+                last_report = now
+                self.save()
+                if progress:
+                    rate = (self.nodes - nodes_before) / (now - started)
+                    print(f"{len(self.done)}/{len(self.units)} units, {self.nodes:,} nodes "
+                          f"({rate:,.0f}/s), {len(self.caps)} caps", file=progress)
+        self.save()
+
+    def classes(self):
+        '''Returns a list of lists of caps, one list per symmetry class.'''
+        classes = []
+        by_profile = {}
+        for cap in self.caps:
+            profile = cover_profile(cap)
+            for members in by_profile.setdefault(profile, []):
+                if equivalent(cap, members[0]):
+                    members.append(cap)
+                    break
+            else:
+                members = [cap]
+                by_profile[profile].append(members)
+                classes.append(members)
+        return classes
+
+    def save(self):
+        '''Writes the search state to the checkpoint file, if there is one.'''
+        if not self.checkpoint:
+            return
+        state = {'min_size': self.min_size, 'split_depth': self.split_depth,
+                 'nodes': self.nodes, 'done': sorted(self.done),
+                 'caps': [format(cap, 'x') for cap in self.caps]}
+        temporary = self.checkpoint + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary, self.checkpoint)
+
+    def resume(self):
+        '''Loads the search state from the checkpoint file, if it exists.'''
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint) as f:
+            state = json.load(f)
+        if (state['min_size'], state['split_depth']) != (self.min_size, self.split_depth):
+            raise ValueError(f'{self.checkpoint} was written with different settings')
+        self.nodes = state['nodes']
+        self.done = set(state['done'])
+        self.caps = [int(cap, 16) for cap in state['caps']]
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Find maximal set-free collections of Set cards.")
+    parser.add_argument("--min-size", type=int, default=20,
+                        help="smallest maximal collection to report (default 20)")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="save progress to FILE and resume from it if it exists")
+    parser.add_argument("--interval", type=float, default=10.0,
+                        help="seconds between progress lines and checkpoints")
+    args = parser.parse_args()
+    search = CapSearch(args.min_size, checkpoint=args.checkpoint)
+    search.resume()
+    started = time.perf_counter()
+    search.run(interval=args.interval)
+    classes = search.classes()
+    print(f"{len(search.caps)} maximal caps containing the basis, {len(classes)} classes "
+          f"({time.perf_counter() - started:.1f} s)")
+    for members in classes:
+        cards = ' '.join(str(CARDS[p]) for p in points(members[0]))
+        print(f"{len(points(members[0]))} cards, {len(members)} found: {cards}")
@@ -1,6 +1,11 @@
 from enum import Enum
 from random import shuffle
 
+try:
+    import numpy as np
+except ImportError:  # is_set_batch falls back to the third-card table
+    np = None
+
 # Enums for Fill, Color, and Shape
 class Fill(Enum):
     EMPTY = 0
@@ -17,16 +22,76 @@ class Shape(Enum):
     OVAL = 5
     PYRAMID = 6
 
+# Each card is encoded as an int in 0..80 whose base-3 digits are, from most
+# to least significant, number - 1, fill, color and shape (enum order).
+FILLS = list(Fill)
+COLORS = list(Color)
+SHAPES = list(Shape)
+
+def card_index(number, fill, color, shape):
+    '''int in [1,3], Fill, Color, Shape -> int in [0,80]
+    Returns the integer encoding of a card.
+    >>> card_index(1, Fill.EMPTY, Color.RED, Shape.QUAD)
+    0
+    >>> card_index(3, Fill.FILLED, Color.BLUE, Shape.PYRAMID)
+    80
+    '''
+    if number not in (1, 2, 3):
+        raise ValueError(f'number must be 1, 2, or 3, not {number!r}')
+    return (((number - 1) * 3 + FILLS.index(fill)) * 3 + COLORS.index(color)) * 3 + SHAPES.index(shape)
+
 # SetCard class representing each card
 class SetCard:
-    def __init__(self, number, fill, color, shape):
+    '''A Set card. There is exactly one instance of each of the 81 cards, so
+    cards compare and hash by identity.
+    >>> SetCard(2, Fill.SHADED, Color.GREEN, Shape.OVAL) is SetCard(2, Fill.SHADED, Color.GREEN, Shape.OVAL)
+    True
+    >>> CARDS[5].index = 7
+    Traceback (most recent call last):
+    ...
+    AttributeError: SetCard is immutable
+    >>> import pickle
+    >>> all(pickle.loads(pickle.dumps(CARDS[5], protocol)) is CARDS[5] for protocol in range(6))
+    True
+    '''
+    __slots__ = ('index',)
+
+    def __new__(cls, number, fill, color, shape):
         '''int in [1,3], Fill, Color, Shape -> SetCard
-        Initialize a SetCard with number, fill, color, and shape.
+        Returns the (shared) SetCard with number, fill, color, and shape.
         '''
-        self.number = number  # 1, 2, or 3
-        self.fill = fill      # Enum Fill
-        self.color = color    # Enum Color
-        self.shape = shape    # Enum Shape
+        return CARDS[card_index(number, fill, color, shape)]
+
+    def __setattr__(self, name, value):
+        '''The cards are shared, so they can't be changed.'''
+        raise AttributeError('SetCard is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('SetCard is immutable')
+
+    def __reduce__(self):
+        '''Lets pickle (any protocol) and copy return the shared instance.'''
+        return (SetCard, (self.number, self.fill, self.color, self.shape))
+
+    @property
+    def number(self):
+        '''1, 2, or 3'''
+        return self.index // 27 + 1
+
+    @property
+    def fill(self):
+        '''Enum Fill'''
+        return FILLS[self.index // 9 % 3]
+
+    @property
+    def color(self):
+        '''Enum Color'''
+        return COLORS[self.index // 3 % 3]
+
+    @property
+    def shape(self):
+        '''Enum Shape'''
+        return SHAPES[self.index % 3]
 
     def __str__(self):
         '''Human-readable representation of this card.'''
@@ -43,54 +108,39 @@ class SetCard:
         '''Returns the third card that makes a set with self and other.
         >>> card1 = SetCard(1, Fill.EMPTY, Color.RED, Shape.QUAD)
         >>> card2 = SetCard(2, Fill.SHADED, Color.RED, Shape.OVAL)
-        >>> print(card1.third_card(card2))  # Expected: 3FGE
-        >>> print(card2.third_card(card1))  # Expected: 3FGE
+        >>> print(card1.third_card(card2))
+        3FRP
+        >>> print(card2.third_card(card1))
+        3FRP
         >>> card3 = SetCard(1, Fill.EMPTY, Color.GREEN, Shape.QUAD)
         >>> card4 = SetCard(2, Fill.SHADED, Color.BLUE, Shape.PYRAMID)
-        >>> print(card3.third_card(card4))  # Expected: 3FER
+        >>> print(card3.third_card(card4))
+        3FRO
         '''
-        # Calculate the attributes of the third card
-        third_number = 6 - self.number - other.number  # Sum of 1, 2, and 3 is always 6
-
-        # Fill calculation
-        if self.fill == other.fill:
-            third_fill = self.fill  # Same fill as the other two
-        else:
-            third_fill_value = 3 - (self.fill.value + other.fill.value)
-            if third_fill_value == 0:
-                third_fill_value = 3
-            third_fill = Fill(third_fill_value)
-
-        # Color calculation
-        if self.color == other.color:
-            third_color = self.color  # Same color as the other two
-        else:
-            third_color_value = (6 - (self.color.value + other.color.value)) % 3
-            if third_color_value == 0:
-                third_color_value = 3
-            third_color = Color(third_color_value)
-
-        # Shape calculation
-        if self.shape == other.shape:
-            third_shape = self.shape  # Same shape as the other two
-        else:
-            third_shape_value = (3 - (self.shape.value // 2 + other.shape.value // 2)) % 3
-            if third_shape_value == 0:
-                third_shape_value = 3
-            third_shape = [Shape.QUAD, Shape.OVAL, Shape.PYRAMID][third_shape_value - 1]  # -1 for zero-based index
-
-        return SetCard(third_number, third_fill, third_color, third_shape)
+        return CARDS[THIRD[self.index * 81 + other.index]]
+
+def _third_index(index1, index2):
+    '''Digit-wise: each base-3 digit of the third card is -(d1 + d2) mod 3.'''
+    third = 0
+    for place in (27, 9, 3, 1):
+        third += (-(index1 // place + index2 // place) % 3) * place
+    return third
+
+# The 81 shared cards, and the 81x81 table of third-card indices.
+CARDS = []
+for _index in range(81):
+    _card = object.__new__(SetCard)
+    object.__setattr__(_card, 'index', _index)
+    CARDS.append(_card)
+CARDS = tuple(CARDS)
+del _index, _card
+THIRD = bytes(_third_index(index1, index2) for index1 in range(81) for index2 in range(81))
 
 # Function to create a complete deck of 81 cards
 def make_deck():
     '''Returns a list containing a complete Set deck with 81 unique cards.
     '''
-    deck = []
-    for number in range(1, 4):  # 1, 2, or 3
-        for fill in Fill:
-            for color in Color:
-                for shape in Shape:
-                    deck.append(SetCard(number, fill, color, shape))
+    deck = list(CARDS)
     shuffle(deck)  # Shuffle the deck to randomize card order
     return deck
 
@@ -98,14 +148,99 @@ def make_deck():
 def is_set(card1, card2, card3):
     '''Determines whether the 3 cards make a set.
     (For each of the 4 traits, all 3 cards are either the same, or all 3 are different.)
+    >>> card1 = SetCard(1, Fill.EMPTY, Color.RED, Shape.QUAD)
+    >>> card2 = SetCard(2, Fill.SHADED, Color.RED, Shape.OVAL)
+    >>> is_set(card1, card2, SetCard(3, Fill.FILLED, Color.RED, Shape.PYRAMID))
+    True
+    >>> is_set(card1, card2, SetCard(3, Fill.FILLED, Color.GREEN, Shape.PYRAMID))
+    False
     '''
-    def all_same_or_all_different(attr1, attr2, attr3):
-        return (attr1 == attr2 == attr3) or (attr1 != attr2 and attr2 != attr3 and attr1 != attr3)
+    return THIRD[card1.index * 81 + card2.index] == card3.index
 
-    return (all_same_or_all_different(card1.number, card2.number, card3.number) and
-            all_same_or_all_different(card1.fill, card2.fill, card3.fill) and
-            all_same_or_all_different(card1.color, card2.color, card3.color) and
-            all_same_or_all_different(card1.shape, card2.shape, card3.shape))
+# Functions to find the sets among the face-up cards
+def find_all_sets(board):
+    '''list of SetCard -> list of (SetCard, SetCard, SetCard)
+    Returns every set on the board once, in board order. Each pair of cards is
+    checked by looking up the card that would complete it.
+    >>> board = [SetCard(1, Fill.EMPTY, Color.RED, Shape.QUAD),
+    ...          SetCard(2, Fill.EMPTY, Color.RED, Shape.QUAD),
+    ...          SetCard(3, Fill.EMPTY, Color.RED, Shape.QUAD),
+    ...          SetCard(1, Fill.SHADED, Color.GREEN, Shape.OVAL),
+    ...          SetCard(1, Fill.FILLED, Color.BLUE, Shape.PYRAMID)]
+    >>> for found in find_all_sets(board):
+    ...     print(*found)
+    1ERQ 2ERQ 3ERQ
+    1ERQ 1SGO 1FBP
+    '''
+    position = {card.index: i for i, card in enumerate(board)}
+    sets = []
+    for i, card1 in enumerate(board):
+        row = card1.index * 81
+        for j in range(i + 1, len(board)):
+            k = position.get(THIRD[row + board[j].index], -1)
+            if k > j:
+                sets.append((card1, board[j], board[k]))
+    return sets
+
+def has_any_set(board):
+    '''list of SetCard -> bool
+    Determines whether the board contains at least one set.
+    >>> has_any_set([SetCard(1, Fill.EMPTY, Color.RED, Shape.QUAD),
+    ...              SetCard(2, Fill.EMPTY, Color.RED, Shape.QUAD),
+    ...              SetCard(3, Fill.EMPTY, Color.RED, Shape.OVAL)])
+    False
+    '''
+    present = {card.index for card in board}
+    for i, card1 in enumerate(board):
+        row = card1.index * 81
+        for card2 in board[i + 1:]:
+            third = THIRD[row + card2.index]
+            if third in present and third != card1.index:
+                return True
+    return False
+
+# Function to classify many triples at once
+def is_set_batch(triples):
+    '''(N, 3) array of card indices -> boolean mask of length N
+    Determines which triples make a set: three cards form a set exactly when
+    each of their base-3 attribute digits sums to a multiple of 3. With NumPy
+    the whole array is classified at once; otherwise a list is returned.
+    >>> from itertools import combinations
+    >>> triples = list(combinations(range(81), 3))
+    >>> mask = is_set_batch(triples)
+    >>> len(triples), sum(map(bool, mask))
+    (85320, 1080)
+    >>> all(bool(m) == is_set(*(CARDS[i] for i in t)) for t, m in zip(triples, mask))
+    True
+    >>> is_set_batch([0, 1, 2])
+    Traceback (most recent call last):
+    ...
+    ValueError: triples must be an (N, 3) array of card indices
+    >>> is_set_batch([(0, 1, 2), (3, 4, 81)])
+    Traceback (most recent call last):
+    ...
+    ValueError: card indices must be in 0..80
+    '''
+    if np is None:
+        mask = []
+        for triple in triples:
+            try:
+                i, j, k = triple
+            except (TypeError, ValueError):
+                raise ValueError('triples must be an (N, 3) array of card indices') from None
+            if not (0 <= i <= 80 and 0 <= j <= 80 and 0 <= k <= 80):
+                raise ValueError('card indices must be in 0..80')
+            mask.append(THIRD[i * 81 + j] == k)
+        return mask
+    triples = np.asarray(triples, dtype=np.int64)
+    if triples.shape == (0,):  # an empty list of triples
+        triples = triples.reshape(0, 3)
+    if triples.ndim != 2 or triples.shape[1] != 3:
+        raise ValueError('triples must be an (N, 3) array of card indices')
+    if triples.size and (triples.min() < 0 or triples.max() > 80):
+        raise ValueError('card indices must be in 0..80')
+    digits = triples[:, :, None] // np.array([27, 9, 3, 1]) % 3
+    return (digits.sum(axis=1) % 3 == 0).all(axis=1)
 
 # Testing the deck creation and sample output
 if __name__ == "__main__":
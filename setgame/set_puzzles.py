@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Program: Set puzzle generator
+Description:
+Builds boards with an exact number of sets ("12 cards containing exactly 6
+sets") one card at a time. For every card not on the board it keeps count
+of how many pairs on the board it would complete, which is exactly how many
+sets adding it would create, and keeps the free cards in one list per count,
+updated as cards are placed and taken back, so the cards with a given count
+are found without a scan. Each step only picks cards that keep the board on
+track for the target, the next to last card must leave a last card that
+completes exactly the missing sets, and a slot that runs out of such cards
+sends the search back to try the previous slot's next choice. Every target
+from 0 to 14 sets on 12 cards runs at thousands of puzzles per second
+(--count 300 --quiet).
+"""
+import random
+import time
+
+from set_game_logic import CARDS, THIRD, find_all_sets
+
+# How far ahead of its even share of the sets each slot aims (see build_board)
+AHEAD = 1.7
+
+def most_new_sets(size, added):
+    '''Returns the most sets that adding added cards to a board of size
+    cards can create: a new card completes at most one pair per 2 cards.
+    >>> most_new_sets(9, 3)
+    14
+    '''
+    return sum((size + i) // 2 for i in range(added))
+
+def build_board(cards, sets, rng, max_steps=20):
+    '''int, int, random.Random -> list of card indices or None
+    Builds a board of cards cards with exactly sets sets. When a slot has no
+    card left that keeps the target reachable, it takes back the last card
+    and tries that slot's next choice. Returns None if max_steps cards are
+    placed without finishing: starting over is cheaper than searching every
+    board that begins with a bad first few cards.
+    >>> board = build_board(12, 13, random.Random(4))
+    >>> len(board), len(find_all_sets([CARDS[card] for card in board]))
+    (12, 13)
+    '''
+    board = []
+    on_board = [False] * 81
+    completes = [0] * 81  # completes[x]: sets that adding x would create
+    # free[n]: the cards off the board with completes n, and where[x]: the
+    # position of x in its list; a card completes at most one pair per 2 cards
+    free = [list(range(81))] + [[] for _ in range(cards // 2 + 1)]
+    where = list(range(81))
+    found = 0
+    # for each slot: how many sets the cards after it can still add, and the
+    # fraction of the sets still needed it should aim for, in proportion to
+    # how many sets it could create compared with the cards after it. Late
+    # cards rarely come near most_new_sets, so each slot aims AHEAD weight
+    # times its share, leaving little for the last cards to make up.
+    room = [most_new_sets(slot + 1, cards - slot - 1) for slot in range(cards)]
+    portion = [AHEAD * (slot // 2) / max(1, most_new_sets(slot, cards - slot))
+               for slot in range(cards)]
+
+    def take(x):
+        '''Removes x from its free list.'''
+        bucket = free[completes[x]]
+        last = bucket.pop()
+        if last != x:
+            bucket[where[x]] = last
+            where[last] = where[x]
+
+    def put(x):
+        '''Adds x to its free list.'''
+        bucket = free[completes[x]]
+        where[x] = len(bucket)
+        bucket.append(x)
+
+    def place(card):
+        '''Adds card to the board.'''
+        nonlocal found
+        take(card)
+        on_board[card] = True
+        found += completes[card]
+        for other in board:
+            third = THIRD[card * 81 + other]
+            if on_board[third]:
+                completes[third] += 1
+            else:
+                take(third)
+                completes[third] += 1
+                put(third)
+        board.append(card)
+
+    def take_back():
+        '''Removes the last card from the board.'''
+        nonlocal found
+        card = board.pop()
+        for other in board:
+            third = THIRD[card * 81 + other]
+            if on_board[third]:
+                completes[third] -= 1
+            else:
+                take(third)
+                completes[third] -= 1
+                put(third)
+        found -= completes[card]
+        on_board[card] = False
+        put(card)
+
+    def leaves_last_card(card, need):
+        '''Returns whether, after card, some card creates exactly the sets
+        still needed. Adding card raises completes only for the thirds of
+        card and the board, each by one.'''
+        left = need - completes[card]
+        spare = (len(free[left]) if left < len(free) else 0) - (completes[card] == left)
+        for other in board:
+            third = THIRD[card * 81 + other]
+            if not on_board[third]:
+                if completes[third] + 1 == left:
+                    return True
+                spare -= completes[third] == left
+        return spare > 0
+
+    def choose(picks, need):
+        '''Returns a random card of picks, or None. For the next to last
+        slot it must leave a last card; picks are checked in random order
+        until one does, since most do.'''
+        if len(board) != cards - 2:
+            return rng.choice(picks) if picks else None
+        while picks:
+            i = rng.randrange(len(picks))
+            if leaves_last_card(picks[i], need):
+                return picks[i]
+            picks[i] = picks[-1]
+            picks.pop()
+        return None
+
+    def pick(tried):
+        '''Returns a card not in tried for the next slot, or None. The card
+        must leave a number of sets the cards after it can still make, and
+        is one of those closest to the slot's share of the sets.'''
+        slot = len(board)
+        need = sets - found
+        share = need * portion[slot]
+        closest = None
+        picks = []
+        for n in sorted(range(max(0, need - room[slot]), min(need, len(free) - 1) + 1),
+                        key=lambda n: abs(n - share)):
+            if closest is not None and abs(n - share) > closest + 0.5:
+                card = choose(picks, need)
+                if card is not None:
+                    return card
+                closest = None  # none of them will do: try the next closest
+                picks = []
+            candidates = [x for x in free[n] if x not in tried]
+            if candidates:
+                if closest is None:
+                    closest = abs(n - share)
+                picks += candidates
+        return choose(picks, need)
+
+    tried = [set()]  # the cards already tried in each slot up to the next
+    for _ in range(max_steps):
+        card = pick(tried[-1])
+        while card is None:
+            if not board:
+                return None
+            # take back the last card and go on with its slot's other choices
+            tried.pop()
+            take_back()
+            card = pick(tried[-1])
+        tried[-1].add(card)
+        place(card)
+        if len(board) == cards:
+            return board
+        tried.append(set())
+    return None
+
+def generate_puzzles(count, cards=12, sets=6, seed=None, max_misses=100_000):
+    '''Yields count distinct boards (lists of SetCard) of cards cards that
+    contain exactly sets sets. Gives up with a ValueError after max_misses
+    dead ends or repeated boards in a row.
+    >>> puzzles = list(generate_puzzles(50, 12, 6, seed=215))
+    >>> len(puzzles), {len(find_all_sets(board)) for board in puzzles}
+    (50, {6})
+    >>> len({frozenset(board) for board in puzzles})
+    50
+    >>> hard = list(generate_puzzles(20, 12, 13, seed=1))
+    >>> {len(find_all_sets(board)) for board in hard}, len({frozenset(board) for board in hard})
+    ({13}, 20)
+    >>> next(generate_puzzles(1, 12, 15, max_misses=100))
+    Traceback (most recent call last):
+    ...
+    ValueError: no new board of 12 cards with exactly 15 sets after 100 tries
+    '''
+    rng = random.Random(seed)
+    seen = set()
+    misses = 0
+    while len(seen) < count:
+        board = build_board(cards, sets, rng)
+        key = None if board is None else frozenset(board)
+        if key is None or key in seen:
+            misses += 1
+            if misses >= max_misses:
+                raise ValueError(f'no new board of {cards} cards with exactly {sets} sets '
+                                 f'after {misses} tries')
+            continue
+        misses = 0
+        seen.add(key)
+        yield [CARDS[card] for card in board]
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description="Generate Set boards with an exact number of sets.")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--cards", type=int, default=12)
+    parser.add_argument("--sets", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="only report the rate")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    for board in generate_puzzles(args.count, args.cards, args.sets, args.seed):
+        if not args.quiet:
+            print(' '.join(map(str, board)))
+    elapsed = time.perf_counter() - started
+    print(f"{args.count} puzzles in {elapsed:.2f} s ({args.count / elapsed:,.0f} puzzles/s)",
+          file=sys.stderr)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Program: Set game simulator
+Description:
+Plays complete, headless games of Set to gather statistics: how often 12
+face-up cards contain no set, how many sets each 12-card board holds, and
+how many cards are left on the table when the deck runs out. Games are
+spread over a process pool; each chunk of games gets its own RNG seed, so
+a seeded run gives the same totals for any number of workers.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import random
+import time
+
+from set_game_logic import CARDS, find_all_sets
+
+CHUNK_GAMES = 1000  # games per pool task (and per RNG seed)
+
+# Pick strategies: (list of sets on the board, random.Random) -> one set
+def pick_first(sets, rng):
+    '''Takes the first set found on the board.'''
+    return sets[0]
+
+def pick_random(sets, rng):
+    '''Takes a uniformly random set from the board.'''
+    return sets[rng.randrange(len(sets))]
+
+STRATEGIES = {'first': pick_first, 'random': pick_random}
+
+def new_stats():
+    '''Returns empty simulation statistics.'''
+    return {'games': 0, 'sets_per_board': Counter(), 'cards_left': Counter()}
+
+def merge_stats(total, stats):
+    '''Adds stats into total and returns total.'''
+    total['games'] += stats['games']
+    total['sets_per_board'].update(stats['sets_per_board'])
+    total['cards_left'].update(stats['cards_left'])
+    return total
+
+def play_game(rng, strategy=pick_random, stats=None):
+    '''random.Random, strategy, stats -> stats
+    Plays one game to the end and records it in stats. Whenever the board has
+    no set, 3 more cards are dealt; the game ends when that is impossible.
+    >>> stats = play_game(random.Random(215))
+    >>> stats['games'], sum(stats['cards_left'].values())
+    (1, 1)
+    >>> [cards % 3 for cards in stats['cards_left']]
+    [0]
+    '''
+    if stats is None:
+        stats = new_stats()
+    deck = list(CARDS)
+    rng.shuffle(deck)
+    board = [deck.pop() for _ in range(12)]
+    while True:
+        sets = find_all_sets(board)
+        if len(board) == 12:
+            stats['sets_per_board'][len(sets)] += 1
+        if sets:
+            for card in strategy(sets, rng):
+                board.remove(card)
+            while len(board) < 12 and deck:
+                board.append(deck.pop())
+        elif deck:
+            board.extend(deck.pop() for _ in range(3))
+        else:
+            break
+    stats['games'] += 1
+    stats['cards_left'][len(board)] += 1
+    return stats
+
+def _play_chunk(task):
+    '''Process-pool worker: plays one chunk of games from its own seed.'''
+    games, seed, strategy = task
+    rng = random.Random(seed)
+    stats = new_stats()
+    for _ in range(games):
+        play_game(rng, strategy, stats)
+    return stats
+
+def simulate(games, workers=None, seed=None, strategy=pick_random):
+    '''int, int, int or None, strategy -> stats
+    Plays games complete games on a pool of workers and merges their
+    statistics. With a seed the result is reproducible for any worker count.
+    >>> a = simulate(300, workers=2, seed=7)
+    >>> b = simulate(300, workers=1, seed=7)
+    >>> a == b, a['games']
+    (True, 300)
+    '''
+    seeds = random.Random(seed) if seed is not None else random.SystemRandom()
+    tasks = []
+    for start in range(0, games, CHUNK_GAMES):
+        tasks.append((min(CHUNK_GAMES, games - start), seeds.getrandbits(64), strategy))
+    total = new_stats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(_play_chunk, tasks):
+            merge_stats(total, stats)
+    return total
+
+def print_summary(stats, elapsed):
+    '''Prints the histograms and throughput of a simulation.'''
+    games = stats['games']
+    boards = sum(stats['sets_per_board'].values())
+    print(f"{games} games in {elapsed:.2f} s ({games / elapsed:,.0f} games/s)")
+    print(f"12-card boards with no set: {stats['sets_per_board'][0] / boards:.4%} of {boards}")
+    print("sets per 12-card board:")
+    for sets, count in sorted(stats['sets_per_board'].items()):
+        print(f"  {sets:2}: {count / boards:.4%}")
+    print("cards left at the end:")
+    for cards, count in sorted(stats['cards_left'].items()):
+        print(f"  {cards:2}: {count / games:.4%}")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulate complete games of Set.")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for a reproducible run")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="random")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    stats = simulate(args.games, args.workers, args.seed, STRATEGIES[args.strategy])
+    print_summary(stats, time.perf_counter() - started)
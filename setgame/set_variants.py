@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Program: Set variants
+Description:
+A Set engine for decks with any number of attributes, each with 3 values.
+A card is an int in [0, 3**attributes) whose base-3 digits are its
+attribute values, most significant first, so the 4-attribute variant uses
+exactly the card indices of set_game_logic. Three cards form a set when
+every digit is all same or all different, i.e. when the digit-wise sum is
+0 mod 3. Third cards are found through a precomputed table for 3-digit
+chunks (27 x 27 entries), and through a full pair table when the deck has
+at most 729 cards.
+"""
+from array import array
+import random
+
+CHUNK_DIGITS = 3
+CHUNK = 3 ** CHUNK_DIGITS
+
+def _chunk_third(a, b):
+    '''Returns the 3-digit chunk that completes a set with chunks a and b.'''
+    third = 0
+    for place in (9, 3, 1):
+        third += (-(a // place + b // place) % 3) * place
+    return third
+
+# CHUNK_THIRD[a * 27 + b]: digit-wise completion of two 3-digit chunks
+CHUNK_THIRD = bytes(_chunk_third(a, b) for a in range(CHUNK) for b in range(CHUNK))
+
+class SetVariant:
+    '''A Set deck with the given number of 3-valued attributes.
+    >>> variant = SetVariant(5)
+    >>> variant.size
+    243
+    >>> variant.digits(variant.third(variant.card(0, 1, 2, 0, 1), variant.card(0, 2, 2, 1, 1)))
+    (0, 0, 2, 2, 1)
+
+    The 4-attribute variant's cards are the indices of set_game_logic's cards:
+    >>> from set_game_logic import CARDS, is_set, find_all_sets
+    >>> from itertools import combinations
+    >>> all(CLASSIC.is_set(*(c.index for c in t)) == is_set(*t) for t in combinations(CARDS, 3))
+    True
+    >>> board = CARDS[::7]
+    >>> [tuple(c.index for c in s) for s in find_all_sets(board)] == CLASSIC.find_all_sets([c.index for c in board])
+    True
+    '''
+    def __init__(self, attributes=4):
+        self.attributes = attributes
+        self.size = 3 ** attributes
+        self.chunks = [CHUNK ** i for i in range(-(-attributes // CHUNK_DIGITS))]
+        self.pairs = None
+        if self.size <= 729:
+            self.pairs = array('H', (self._third_by_chunks(a, b)
+                                     for a in range(self.size) for b in range(self.size)))
+
+    def card(self, *digits):
+        '''Returns the card with the given attribute values (each 0, 1, or 2).'''
+        if len(digits) != self.attributes or any(d not in (0, 1, 2) for d in digits):
+            raise ValueError(f'expected {self.attributes} values in [0, 2], got {digits}')
+        card = 0
+        for digit in digits:
+            card = card * 3 + digit
+        return card
+
+    def digits(self, card):
+        '''Returns the attribute values of card, most significant first.'''
+        values = []
+        for _ in range(self.attributes):
+            card, digit = divmod(card, 3)
+            values.append(digit)
+        return tuple(reversed(values))
+
+    def _third_by_chunks(self, a, b):
+        '''Completes a set with a and b one 3-digit chunk at a time.'''
+        third = 0
+        for place in self.chunks:
+            third += CHUNK_THIRD[a // place % CHUNK * CHUNK + b // place % CHUNK] * place
+        return third
+
+    def third(self, a, b):
+        '''Returns the card that makes a set with cards a and b.'''
+        if self.pairs is not None:
+            return self.pairs[a * self.size + b]
+        return self._third_by_chunks(a, b)
+
+    def is_set(self, a, b, c):
+        '''Determines whether the 3 cards make a set.'''
+        return self.third(a, b) == c
+
+    def make_deck(self, rng=random):
+        '''Returns a shuffled list of every card of the variant.'''
+        deck = list(range(self.size))
+        rng.shuffle(deck)
+        return deck
+
+    def find_all_sets(self, board):
+        '''list of cards -> list of (card, card, card)
+        Returns every set on the board once, in board order.
+        >>> SetVariant(6).find_all_sets([0, 1, 2, 3, 6])
+        [(0, 1, 2), (0, 3, 6)]
+        '''
+        position = {card: i for i, card in enumerate(board)}
+        third = self.third
+        sets = []
+        for i, card1 in enumerate(board):
+            for j in range(i + 1, len(board)):
+                k = position.get(third(card1, board[j]), -1)
+                if k > j:
+                    sets.append((card1, board[j], board[k]))
+        return sets
+
+    def has_any_set(self, board):
+        '''list of cards -> bool
+        Determines whether the board contains at least one set.
+        '''
+        present = set(board)
+        third = self.third
+        for i, card1 in enumerate(board):
+            for card2 in board[i + 1:]:
+                card3 = third(card1, card2)
+                if card3 in present and card3 != card1:
+                    return True
+        return False
+
+# The classic 81-card deck: card i is set_game_logic.CARDS[i]
+CLASSIC = SetVariant(4)
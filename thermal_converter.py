@@ -21,8 +21,153 @@ https://en.wikipedia.org/wiki/Conversion_of_scales_of_temperature
 >>> convert_temperature(100, 'C', 'F')
 212.0
 """
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+from fractions import Fraction
+import io
+import json
+import mmap
+import os
+import textwrap
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # convert_many falls back to a loop over memoryviews
+    np = None
+
+# The scale registry: every scale is affine in Celsius, celsius = a * temperature + b
+CELSIUS_COEFFICIENTS = {}  # symbol -> (a, b) as exact Fractions
+SCALE_NAMES = {}  # symbol -> full name, in the order the scales were registered
+SCALE_SYMBOLS = {}  # lower-case symbol -> symbol, for reading user input
+TO_CELSIUS = {}  # symbol -> function from the scale to Celsius
+FROM_CELSIUS = {}  # symbol -> function from Celsius to the scale
+
+class _PairCache(dict):
+    """
+    A dict keyed by (from_scale, to_scale) that builds a missing pair with
+    build(from_scale, to_scale) on first use and keeps it. Pairs are kept
+    under the registered symbols only; other spellings are looked up again
+    under those.
+
+    >>> CONVERSIONS[('f', 'c')] == CONVERSIONS[('F', 'C')], ('f', 'c') in CONVERSIONS
+    (True, False)
+    """
+    def __init__(self, build):
+        super().__init__()
+        self.build = build
+
+    def __missing__(self, pair):
+        key = tuple(parse_scale(scale) for scale in pair)
+        if key != pair:
+            return self[key]
+        value = self[pair] = self.build(*pair)
+        return value
+
+def _exact(number):
+    """
+    Returns number as a Fraction; floats are taken at their shortest repr.
+    """
+    return Fraction(repr(number)) if isinstance(number, float) else Fraction(number)
+
+def register_scale(symbol, name, a, b=0):
+    """
+    Adds (or recalibrates) the scale symbol, on which a temperature t is
+    a * t + b degrees Celsius. a and b may be ints, floats, Fractions or
+    decimal strings. Cached conversions are dropped, so they are composed
+    again with the new scale on first use.
+
+    >>> register_scale('S1', 'Sensor 1', 1, '-0.3')  # reads 0.3 °C high
+    >>> convert_temperature(20.3, 'S1', 'C'), convert_temperature(68, 'F', 'S1')
+    (20.0, 20.3)
+    >>> parse_scale(' s1 ')
+    'S1'
+    >>> unregister_scale('S1')
+    """
+    a, b = _exact(a), _exact(b)
+    if a == 0:
+        raise ValueError("a must not be 0")
+    if SCALE_SYMBOLS.get(symbol.lower(), symbol) != symbol:
+        raise ValueError(f"{symbol!r} clashes with scale {SCALE_SYMBOLS[symbol.lower()]!r}")
+    CELSIUS_COEFFICIENTS[symbol] = (a, b)
+    SCALE_NAMES[symbol] = name
+    SCALE_SYMBOLS[symbol.lower()] = symbol
+    if (a, b) == (1, 0):
+        TO_CELSIUS[symbol] = FROM_CELSIUS[symbol] = lambda x: x
+    else:
+        # (x - zero) * numerator / denominator, where zero is the reading at 0 °C,
+        # keeps the rounding of the textbook formulas: (x - 32) * 5 / 9 for F
+        zero = float(-b / a)
+        TO_CELSIUS[symbol] = lambda x: (x - zero) * a.numerator / a.denominator
+        FROM_CELSIUS[symbol] = lambda x: x * a.denominator / a.numerator + zero
+    CONVERSIONS.clear()
+    CONVERTERS.clear()
+
+def unregister_scale(symbol):
+    """
+    Removes the scale symbol and drops the cached conversions.
+    """
+    for table in (CELSIUS_COEFFICIENTS, SCALE_NAMES, TO_CELSIUS, FROM_CELSIUS):
+        del table[symbol]
+    del SCALE_SYMBOLS[symbol.lower()]
+    CONVERSIONS.clear()
+    CONVERTERS.clear()
+
+def parse_scale(text):
+    """
+    Returns the registered symbol that text names, ignoring case and spaces.
+
+    >>> parse_scale('ra')
+    'Ra'
+    >>> parse_scale('X')
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown temperature scale 'X' (choose from C, D, F, K, N, Ra, Re, Ro)
+    """
+    symbol = SCALE_SYMBOLS.get(text.strip().lower())
+    if symbol is None:
+        raise ValueError(f"unknown temperature scale {text.strip()!r} "
+                         f"(choose from {', '.join(SCALE_NAMES)})")
+    return symbol
+
+def compose_coefficients(from_scale, to_scale):
+    """
+    Returns the (scale, offset) floats of the direct conversion
+    target = temperature * scale + offset, composed exactly before rounding.
+
+    >>> compose_coefficients('C', 'F')
+    (1.8, 32.0)
+    >>> compose_coefficients('K', 'Ra')
+    (1.8, 0.0)
+    """
+    a_from, b_from = CELSIUS_COEFFICIENTS[parse_scale(from_scale)]
+    a_to, b_to = CELSIUS_COEFFICIENTS[parse_scale(to_scale)]
+    return float(a_from / a_to), float((b_from - b_to) / a_to)
+
+def _build_converter(from_scale, to_scale):
+    """
+    Returns a new function that converts from from_scale to to_scale.
+    """
+    if from_scale == to_scale:
+        return lambda temperature: temperature
+    scale, offset = CONVERSIONS[(from_scale, to_scale)]
+    return lambda temperature: temperature * scale + offset
+
+# CONVERSIONS[(from_scale, to_scale)]: (scale, offset), composed on first use;
+# CONVERTERS holds the compiled functions the same way
+CONVERSIONS = _PairCache(compose_coefficients)
+CONVERTERS = _PairCache(_build_converter)
+
+register_scale('C', 'Celsius', 1, 0)
+register_scale('D', 'Delisle', Fraction(-2, 3), 100)
+register_scale('F', 'Fahrenheit', Fraction(5, 9), Fraction(-32) * Fraction(5, 9))
+register_scale('K', 'Kelvin', 1, '-273.15')
+register_scale('N', 'Newton', Fraction(100, 33), 0)
+register_scale('Ra', 'Rankine', Fraction(5, 9), Fraction('-491.67') * Fraction(5, 9))
+register_scale('Re', 'Réaumur', Fraction(5, 4), 0)
+register_scale('Ro', 'Rømer', Fraction(40, 21), Fraction('-7.5') * Fraction(40, 21))
 
-# Conversion dictionaries
 def to_celsius(scale, temperature):
     """
     Converts a temperature from the given scale to Celsius.
@@ -62,17 +207,7 @@ def to_celsius(scale, temperature):
     >>> round(to_celsius('D', 0), 2)
     100.0
     """
-    conversion_dict = {
-        'C': lambda x: x,
-        'F': lambda x: (x - 32) * 5 / 9,
-        'K': lambda x: x - 273.15,
-        'Ra': lambda x: (x - 491.67) * 5 / 9,
-        'Re': lambda x: x * 5 / 4,
-        'N': lambda x: x * 100 / 33,
-        'Ro': lambda x: (x - 7.5) * 40 / 21,
-        'D': lambda x: 100 - (x * 2 / 3)
-    }
-    return conversion_dict[scale](temperature)
+    return TO_CELSIUS[scale](temperature)
 
 def from_celsius(scale, temperature):
     """
@@ -127,17 +262,7 @@ def from_celsius(scale, temperature):
     >>> from_celsius('D', 100)
     0.0
     """
-    conversion_dict = {
-        'C': lambda x: x,
-        'F': lambda x: (x * 9/5) + 32,
-        'K': lambda x: x + 273.15,
-        'Ra': lambda x: (x * 9/5) + 491.67,
-        'Re': lambda x: x * 4/5,
-        'N': lambda x: x * 33/100,
-        'Ro': lambda x: (x * 21/40) + 7.5,
-        'D': lambda x: (100 - x) * 3/2
-    }
-    return conversion_dict[scale](temperature)
+    return FROM_CELSIUS[scale](temperature)
 
 def convert_temperature(temperature, from_scale, to_scale):
     """
@@ -150,29 +275,380 @@ def convert_temperature(temperature, from_scale, to_scale):
     212.0
     
     >>> convert_temperature(76.12, 'K', 'Ra')
-    137.01600000000008
+    137.01600000000002
+
+    It agrees with converting through Celsius:
+
+    >>> all(abs(convert_temperature(t, f, s) - from_celsius(s, to_celsius(f, t))) < 1e-9
+    ...     for f in SCALE_NAMES for s in SCALE_NAMES for t in (-459.67, -40, 0, 36.6, 100, 1e4))
+    True
     """
     if from_scale == to_scale:
         return temperature
-    
-    celsius_value = to_celsius(from_scale, temperature)
-    target_value = from_celsius(to_scale, celsius_value)
-    
-    return target_value
+    scale, offset = CONVERSIONS[(from_scale, to_scale)]
+    return temperature * scale + offset
 
-def print_conversion(temperature, from_scale, to_scale, target_value):
+def compile_conversion(from_scale, to_scale):
     """
-    Prints the conversion result.
+    Returns a function that converts temperatures from from_scale to to_scale.
+
+    The function is compiled on first use and cached:
+
+    >>> f_to_c = compile_conversion('F', 'C')
+    >>> f_to_c(212), f_to_c(-40)
+    (100.0, -40.0)
+    >>> compile_conversion('F', 'C') is f_to_c
+    True
+    """
+    return CONVERTERS[(from_scale, to_scale)]
+
+def _flat_view(buffer):
+    """
+    Returns a flat memoryview of a float buffer.
+    """
+    view = memoryview(buffer)
+    if view.format not in ('d', 'f'):
+        raise TypeError(f"expected a buffer of floats, not format {view.format!r}")
+    return view.cast('B').cast(view.format)
+
+BLOCK_SIZE = 1 << 16  # float32 values convert_many converts per float64 block
+
+def convert_many(values, from_scale, to_scale, out=None):
+    """
+    Converts every temperature in values (a NumPy array, array.array('d'),
+    or other buffer of floats) from from_scale to to_scale. The results are
+    written into out, or back into values when out is None; nothing is
+    copied. Returns the buffer written to.
+
+    >>> from array import array
+    >>> readings = array('d', [32.0, 212.0, -40.0])
+    >>> convert_many(readings, 'F', 'C')
+    array('d', [0.0, 100.0, -40.0])
+    >>> kelvin = array('d', bytes(24))
+    >>> convert_many(readings, 'C', 'K', out=kelvin)
+    array('d', [273.15, 373.15, 233.14999999999998])
+
+    float32 values are converted in float64 and rounded once when stored,
+    so the results do not depend on whether NumPy is installed:
+
+    >>> convert_many(array('f', [212.0, 451.0]), 'F', 'C')
+    array('f', [100.0, 232.77777099609375])
+    """
+    scale, offset = (1.0, 0.0) if from_scale == to_scale else CONVERSIONS[(from_scale, to_scale)]
+    if out is None:
+        out = values
+    if np is not None:
+        source = values if isinstance(values, np.ndarray) else np.frombuffer(values, _flat_view(values).format)
+        target = out if isinstance(out, np.ndarray) else np.frombuffer(out, _flat_view(out).format)
+        if source.shape != target.shape:
+            raise ValueError("values and out must have the same shape")
+        if source.dtype == target.dtype == np.float64:
+            np.multiply(source, scale, out=target)
+            np.add(target, offset, out=target)
+        elif source.flags.c_contiguous and target.flags.c_contiguous:
+            # float32 data: work in float64 and round once on the store, as
+            # the loop below does, one block at a time
+            source, target = source.reshape(-1), target.reshape(-1)
+            block = np.empty(min(BLOCK_SIZE, len(source)))
+            for start in range(0, len(source), BLOCK_SIZE):
+                stop = min(start + BLOCK_SIZE, len(source))
+                part = block[:stop - start]
+                np.multiply(source[start:stop], scale, out=part, dtype=np.float64)
+                np.add(part, offset, out=target[start:stop], casting='same_kind')
+        else:
+            np.add(np.multiply(source, scale, dtype=np.float64), offset,
+                   out=target, casting='same_kind')
+        return out
+    source = _flat_view(values)
+    target = _flat_view(out)
+    if len(source) != len(target):
+        raise ValueError("values and out must have the same length")
+    for i, temperature in enumerate(source):
+        target[i] = temperature * scale + offset
+    return out
+
+SLICE_SIZE = 1 << 26  # bytes per slice of convert_file, a multiple of the page size
+FILE_DTYPES = {'float64': 'd', 'float32': 'f'}
+
+def _convert_slice(task):
+    """
+    Process-pool worker: maps one slice of the file itself, converts it, and
+    returns (index, crc32 of the converted slice). A slice whose checkpointed
+    checksum still matches is left alone. Converting in place first saves the
+    slice to an undo file, so an interrupted slice can be restored.
+    """
+    source, target, dtype, from_scale, to_scale, index, start, length, expected = task
+    with open(target, 'r+b') as f, mmap.mmap(f.fileno(), length, offset=start) as mapped:
+        if expected is not None:
+            if zlib.crc32(mapped) == expected:
+                return index, expected
+            if source == target:
+                raise ValueError(f"slice {index} of {target} changed since it was converted")
+        if source == target:
+            with open(f"{target}.undo{index}", 'wb') as undo:
+                undo.write(zlib.crc32(mapped).to_bytes(4, 'little'))
+                undo.write(mapped)
+                undo.flush()
+                os.fsync(undo.fileno())
+            with memoryview(mapped) as raw, raw.cast(dtype) as values:
+                convert_many(values, from_scale, to_scale)
+        else:
+            with open(source, 'rb') as s, \
+                    mmap.mmap(s.fileno(), length, offset=start, access=mmap.ACCESS_READ) as read:
+                with memoryview(read) as raw_in, raw_in.cast(dtype) as values, \
+                        memoryview(mapped) as raw_out, raw_out.cast(dtype) as out:
+                    convert_many(values, from_scale, to_scale, out=out)
+        mapped.flush()
+        return index, zlib.crc32(mapped)
+
+def _restore_slice(target, index, start):
+    """
+    Puts back the original bytes of a slice from its undo file, if the undo
+    file was written completely, and deletes the undo file.
+    """
+    undo = f"{target}.undo{index}"
+    if not os.path.exists(undo):
+        return
+    with open(undo, 'rb') as f:
+        checksum, original = int.from_bytes(f.read(4), 'little'), f.read()
+    if zlib.crc32(original) == checksum:
+        with open(target, 'r+b') as f:
+            f.seek(start)
+            f.write(original)
+            f.flush()
+            os.fsync(f.fileno())
+    # otherwise the run stopped while saving the slice, before converting it
+    os.remove(undo)
+
+def convert_file(path, from_scale, to_scale, dtype='d', output=None, workers=None,
+                 slice_size=SLICE_SIZE, progress=None):
+    """
+    Converts a raw binary file of float64 ('d') or float32 ('f') temperatures,
+    in place or into output. The file is split into page-aligned slices that
+    worker processes memory-map and convert themselves, so no temperatures
+    pass between processes. Finished slices and their checksums are saved to
+    "<target>.progress"; running again after an interruption verifies them,
+    skips them, and converts the rest. Returns the number of temperatures.
+    progress, if given, is called with the number of bytes done so far.
+
+    >>> import tempfile
+    >>> directory = tempfile.TemporaryDirectory()
+    >>> path = os.path.join(directory.name, 'readings.f64')
+    >>> with open(path, 'wb') as f:
+    ...     _ = f.write(array('d', [32.0, 212.0] * 1024).tobytes())
+    >>> convert_file(path, 'F', 'C', slice_size=mmap.ALLOCATIONGRANULARITY, workers=2)
+    2048
+    >>> with open(path, 'rb') as f:
+    ...     set(array('d', f.read()))
+    {0.0, 100.0}
+    >>> convert_file(path, 'C', 'K', output=path + '.k', workers=1)
+    2048
+    >>> with open(path + '.k', 'rb') as f:
+    ...     array('d', f.read())[:2]
+    array('d', [273.15, 373.15])
+
+    float32 files give the same bytes, and checksums, with or without NumPy:
+
+    >>> with open(path + '.f32', 'wb') as f:
+    ...     _ = f.write(array('f', [212.0, 451.0]).tobytes())
+    >>> convert_file(path + '.f32', 'F', 'C', dtype='f', workers=1)
+    2
+    >>> with open(path + '.f32', 'rb') as f:
+    ...     array('f', f.read())
+    array('f', [100.0, 232.77777099609375])
+    >>> directory.cleanup()
+    """
+    itemsize = array(dtype).itemsize
+    if slice_size % mmap.ALLOCATIONGRANULARITY:
+        raise ValueError(f"slice_size must be a multiple of {mmap.ALLOCATIONGRANULARITY}")
+    size = os.path.getsize(path)
+    if size % itemsize:
+        raise ValueError(f"{path} is not a whole number of {itemsize}-byte floats")
+    source = os.path.abspath(path)
+    target = os.path.abspath(output) if output else source
+    checkpoint = target + '.progress'
+    settings = {'source': source, 'size': size, 'dtype': dtype, 'from': from_scale,
+                'to': to_scale, 'slice_size': slice_size}
+    done = {}
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if state['settings'] != settings:
+            raise ValueError(f'{checkpoint} was written with different settings')
+        done = {int(index): checksum for index, checksum in state['done'].items()}
+    elif target != source:
+        with open(target, 'wb') as f:
+            f.truncate(size)
+
+    def save():
+        temporary = checkpoint + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'settings': settings, 'done': done}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, checkpoint)
+
+    save()
+    starts = range(0, size, slice_size)
+    if target == source:
+        for index, start in enumerate(starts):
+            if index in done:
+                if os.path.exists(f"{target}.undo{index}"):
+                    os.remove(f"{target}.undo{index}")
+            else:
+                _restore_slice(target, index, start)
+    tasks = [(source, target, dtype, from_scale, to_scale, index, start,
+              min(slice_size, size - start), done.get(index))
+             for index, start in enumerate(starts)]
+    finished = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(_convert_slice, task) for task in tasks]):
+            index, checksum = future.result()
+            if done.get(index) != checksum:
+                done[index] = checksum
+                save()
+                if target == source:
+                    os.remove(f"{target}.undo{index}")
+            finished += tasks[index][7]
+            if progress:
+                progress(finished)
+    os.remove(checkpoint)
+    return size // itemsize
+
+def format_conversion(temperature, from_scale, to_scale, target_value):
+    """
+    Returns the conversion result as print_conversion shows it.
+
+    >>> format_conversion(0, 'C', 'K', 273.15)
+    '0.00°C = 273.15K'
     """
     if from_scale == 'K':
-        print("\n{:.2f}{} = {:.2f}°{}".format(
-            temperature, from_scale, target_value, to_scale))
+        return "{:.2f}{} = {:.2f}°{}".format(
+            temperature, from_scale, target_value, to_scale)
     elif to_scale == 'K':
-        print("\n{:.2f}°{} = {:.2f}{}".format(
-            temperature, from_scale, target_value, to_scale))
+        return "{:.2f}°{} = {:.2f}{}".format(
+            temperature, from_scale, target_value, to_scale)
     else:
-        print("\n{:.2f}°{} = {:.2f}°{}".format(
-            temperature, from_scale, target_value, to_scale))
+        return "{:.2f}°{} = {:.2f}°{}".format(
+            temperature, from_scale, target_value, to_scale)
+
+def print_conversion(temperature, from_scale, to_scale, target_value):
+    """
+    Prints the conversion result.
+    """
+    print("\n" + format_conversion(temperature, from_scale, to_scale, target_value))
+
+BAD_ROWS = ('error', 'skip', 'keep')
+
+def _convert_quoted_row(line, delimiter, column, convert):
+    """
+    Converts column of a delimited row that has quotes, with the csv module.
+    """
+    fields = next(csv.reader([line], delimiter=delimiter))
+    if column >= len(fields):
+        raise ValueError(f"no column {column} in {line!r}")
+    fields[column] = "{:.2f}".format(convert(float(fields[column])))
+    row = io.StringIO()
+    csv.writer(row, delimiter=delimiter, lineterminator='').writerow(fields)
+    return row.getvalue()
+
+def convert_stream(infile, outfile, from_scale, to_scale, column=None,
+                   delimiter=',', header=False, bad_rows='error', chunk_size=1 << 20):
+    """
+    Converts a stream of temperatures and returns (rows converted, bad rows).
+    Without a column, every line holds one temperature and is written as
+    print_conversion shows it; with a column, that field of each delimited
+    row is replaced by the converted value with 2 decimals. Rows with quotes
+    are read and written with the csv module, but a quoted field must not
+    span lines. Lines are handled in batches of about chunk_size bytes, so
+    memory use does not grow with the input.
+
+    >>> out = io.StringIO()
+    >>> convert_stream(io.StringIO("32\\n212\\n"), out, 'F', 'C')
+    (2, 0)
+    >>> print(out.getvalue(), end="")
+    32.00°F = 0.00°C
+    212.00°F = 100.00°C
+    >>> out = io.StringIO()
+    >>> convert_stream(io.StringIO('time,temp\\n10:00,300\\n"Oct 3, 10:01",301.5\\n'), out,
+    ...                'K', 'C', column=1, header=True)
+    (2, 0)
+    >>> print(out.getvalue(), end="")
+    time,temp
+    10:00,26.85
+    "Oct 3, 10:01",28.35
+
+    A row whose temperature is missing or not a number stops the conversion
+    (after writing the rows before it) with its line number, or, with
+    bad_rows 'skip' or 'keep', is left out or copied through unchanged:
+
+    >>> data = "id,temp\\n1,32\\n2,abc\\n3\\n4,212\\n"
+    >>> convert_stream(io.StringIO(data), io.StringIO(), 'F', 'C', column=1, header=True)
+    Traceback (most recent call last):
+    ...
+    ValueError: line 3: could not convert string to float: 'abc'
+    >>> out = io.StringIO()
+    >>> convert_stream(io.StringIO(data), out, 'F', 'C', column=1, header=True, bad_rows='keep')
+    (2, 2)
+    >>> print(out.getvalue(), end="")
+    id,temp
+    1,0.00
+    2,abc
+    3
+    4,100.00
+    """
+    if bad_rows not in BAD_ROWS:
+        raise ValueError(f"bad_rows must be one of {', '.join(BAD_ROWS)}")
+    from_scale, to_scale = parse_scale(from_scale), parse_scale(to_scale)
+    convert = compile_conversion(from_scale, to_scale)
+    rows = bad = 0
+    line_number = 0
+    if header:
+        outfile.write(infile.readline())
+        line_number = 1
+    while lines := infile.readlines(chunk_size):
+        converted = []
+        for line in lines:
+            line_number += 1
+            line = line.rstrip('\r\n')
+            if not line:
+                converted.append(line)
+                continue
+            try:
+                if column is None:
+                    temperature = float(line)
+                    converted.append(format_conversion(temperature, from_scale, to_scale,
+                                                       convert(temperature)))
+                elif '"' in line:
+                    converted.append(_convert_quoted_row(line, delimiter, column, convert))
+                else:
+                    fields = line.split(delimiter)
+                    if column >= len(fields):
+                        raise ValueError(f"no column {column} in {line!r}")
+                    fields[column] = "{:.2f}".format(convert(float(fields[column])))
+                    converted.append(delimiter.join(fields))
+            except ValueError as error:
+                if bad_rows == 'error':
+                    outfile.write('\n'.join(converted + ['']))
+                    raise ValueError(f"line {line_number}: {error}") from None
+                bad += 1
+                if bad_rows == 'keep':
+                    converted.append(line)
+                continue
+            rows += 1
+        converted.append('')
+        outfile.write('\n'.join(converted))
+    return rows, bad
+
+def prompt_scale(prompt):
+    """
+    Asks for a scale until the answer is a registered one.
+    """
+    while True:
+        try:
+            return parse_scale(input(prompt))
+        except ValueError as error:
+            print(error)
 
 def main():
     """
@@ -181,19 +657,82 @@ def main():
     # Explain what the program does
     print("Welcome to my Thermal Converter!")
     print("This program converts temperatures between the following scales:")
-    print("Celsius (C), Delisle (D), Fahrenheit (F), Kelvin (K), Newton (N),")
-    print("Rankine (Ra), Réaumur (Re), Rømer (Ro).\n")
-    
+    print(textwrap.fill(", ".join(f"{name} ({symbol})" for symbol, name in SCALE_NAMES.items())
+                        + ".", width=70) + "\n")
+
     # Prompt user for input
     temperature = float(input("Temperature to convert: "))
-    from_scale = input("Starting scale (C, D, F, K, N, Ra, Re, Ro): ").strip().title()
-    to_scale = input("Target scale (C, D, F, K, N, Ra, Re, Ro): ").strip().title()
+    symbols = ", ".join(SCALE_NAMES)
+    from_scale = prompt_scale(f"Starting scale ({symbols}): ")
+    to_scale = prompt_scale(f"Target scale ({symbols}): ")
 
     # Conversion and printing
     target_value = convert_temperature(temperature, from_scale, to_scale)
     print_conversion(temperature, from_scale, to_scale, target_value)
 
 if __name__ == "__main__":
-    import doctest
-    doctest.testmod()
-    main()
+    import sys
+    if len(sys.argv) > 1:
+        import argparse
+        import time
+        parser = argparse.ArgumentParser(description="Convert a stream or file of temperatures.")
+        def scale_argument(text):
+            try:
+                return parse_scale(text)
+            except ValueError as error:
+                raise argparse.ArgumentTypeError(str(error)) from None
+        scales = ", ".join(SCALE_NAMES)
+        parser.add_argument("from_scale", type=scale_argument, help=f"one of {scales}")
+        parser.add_argument("to_scale", type=scale_argument, help=f"one of {scales}")
+        parser.add_argument("--column", type=int, default=None,
+                            help="0-based column of delimited rows to convert "
+                                 "(default: one temperature per line); rows with quotes "
+                                 "are parsed as CSV, but a quoted field must not span lines")
+        parser.add_argument("--delimiter", default=",")
+        parser.add_argument("--header", action="store_true",
+                            help="copy the first line through unchanged")
+        parser.add_argument("--bad-rows", choices=BAD_ROWS, default="error",
+                            help="what to do with rows whose temperature is missing or not "
+                                 "a number: stop with the line number (default), skip them, "
+                                 "or keep them unchanged")
+        parser.add_argument("--input", default="-", help="input file (default: stdin)")
+        parser.add_argument("--output", default=None,
+                            help="output file (default: stdout, or in place with --binary)")
+        parser.add_argument("--binary", choices=sorted(FILE_DTYPES),
+                            help="the input is a raw file of floats, converted with a process "
+                                 "pool; an interrupted run resumes where it stopped")
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--slice-mb", type=int, default=SLICE_SIZE >> 20,
+                            help="size of the slices of a --binary file in MiB")
+        args = parser.parse_args()
+        started = time.perf_counter()
+        if args.binary:
+            if args.input == "-":
+                parser.error("--binary needs an --input file")
+            def report(finished):
+                print(f"\r{finished >> 20} MiB", end="", file=sys.stderr)
+            values = convert_file(args.input, args.from_scale, args.to_scale,
+                                  FILE_DTYPES[args.binary], args.output, args.workers,
+                                  args.slice_mb << 20, report)
+            elapsed = time.perf_counter() - started
+            print(f"\r{values} values in {elapsed:.2f} s ({values / elapsed:,.0f} values/s)",
+                  file=sys.stderr)
+        else:
+            infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+            outfile = (sys.stdout if args.output in (None, "-")
+                       else open(args.output, "w", encoding="utf-8", buffering=1 << 20))
+            try:
+                rows, bad = convert_stream(infile, outfile, args.from_scale, args.to_scale,
+                                           args.column, args.delimiter, args.header,
+                                           args.bad_rows)
+            except ValueError as error:
+                sys.exit(f"{args.input}: {error}")
+            finally:
+                if outfile is not sys.stdout:
+                    outfile.close()
+            elapsed = time.perf_counter() - started
+            print(f"{rows} rows in {elapsed:.2f} s ({rows / elapsed:,.0f} rows/s)"
+                  + (f", {bad} bad rows {'skipped' if args.bad_rows == 'skip' else 'kept'}"
+                     if bad else ""), file=sys.stderr)
+    else:
+        main()